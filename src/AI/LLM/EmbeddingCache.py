@@ -0,0 +1,121 @@
+import hashlib
+from collections import OrderedDict
+from typing import List
+import numpy as np
+from .LLMInterface import LLMInterface
+from .LLMWrapper import LLMWrapper
+from utils import logging
+logger = logging.get_logger(__name__)
+
+
+class EmbeddingCache(LLMWrapper):
+    """
+    content addressed cache in front of an embedding client, vectors are keyed by
+    (provider, model id, embedding size, document type, sha256 of the text) and looked up
+    in an in-process LRU first, then in an optional persistent store
+    """
+    def __init__(self, client: LLMInterface, provider: str, store=None, max_entries: int = 10000):
+
+        super().__init__(client=client)
+        self.provider = provider
+        self.store = store
+        self.max_entries = max_entries
+
+        # float32 arrays take a quarter of the memory of lists of python floats
+        self.entries = OrderedDict()
+
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.store_errors = 0
+
+    async def embed_many(self, texts: List[str], document_type: str = None):
+        keys = [self.make_key(text=text, document_type=document_type) for text in texts]
+        found = {key: self.entries[key] for key in set(keys) if key in self.entries}
+        for key in found:
+            self.entries.move_to_end(key)
+        self.memory_hits += sum(1 for key in keys if key in found)
+
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing and self.store is not None:
+            stored = await self.load(keys=missing)
+            self.store_hits += sum(1 for key in keys if key in stored)
+            for key, vector in stored.items():
+                found[key] = vector
+                self.remember(key=key, vector=vector)
+            missing = [key for key in missing if key not in stored]
+
+        if missing:
+            # identical texts within the call are embedded once
+            texts_by_key = dict(zip(keys, texts))
+            self.misses += sum(1 for key in keys if key not in found)
+
+            vectors = await self.client.embed_many(texts=[texts_by_key[key] for key in missing],
+                                                   document_type=document_type)
+            if vectors is None:
+                return None
+
+            # rows are copied so an evicted entry never pins the rest of its batch matrix
+            computed = {key: np.array(vector, dtype=np.float32) for key, vector in zip(missing, vectors)}
+            for key, vector in computed.items():
+                found[key] = vector
+                self.remember(key=key, vector=vector)
+            await self.save(vectors=computed, document_type=document_type)
+
+        if not keys:
+            return self.stack_vectors([])
+        return np.stack([found[key] for key in keys])
+
+    def make_key(self, text: str, document_type: str = None) -> str:
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return (f"{self.provider}:{self.client.embedding_model_id}:{self.client.embedding_size}:"
+                f"{document_type or ''}:{text_hash}")
+
+    def remember(self, key: str, vector: np.ndarray):
+        self.entries[key] = vector
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    async def load(self, keys: List[str]) -> dict:
+        try:
+            stored = await self.store.get_vectors(keys=keys)
+        except Exception as e:
+            # the persistent tier is an optimization, embedding goes on without it
+            self.store_errors += 1
+            logger.error(f"Error reading the embedding cache store: {e}")
+            return {}
+
+        return {key: np.frombuffer(packed, dtype=np.float32) for key, packed in stored.items()}
+
+    async def save(self, vectors: dict, document_type: str = None):
+        if self.store is None:
+            return
+
+        try:
+            await self.store.insert_vectors(
+                vectors={key: vector.tobytes() for key, vector in vectors.items()},
+                provider=self.provider,
+                model_id=self.client.embedding_model_id,
+                embedding_size=self.client.embedding_size,
+                document_type=document_type,
+            )
+        except Exception as e:
+            self.store_errors += 1
+            logger.error(f"Error writing to the embedding cache store: {e}")
+
+    def get_stats(self) -> dict:
+        stats = self.client.get_stats() if hasattr(self.client, "get_stats") else {}
+        stats["cache"] = {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "persistent": self.store is not None,
+            "memory_hits": self.memory_hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "store_errors": self.store_errors,
+        }
+        return stats
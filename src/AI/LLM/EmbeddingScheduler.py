@@ -0,0 +1,165 @@
+import asyncio
+import random
+import time
+from typing import List
+from .LLMInterface import LLMInterface
+from .LLMWrapper import LLMWrapper
+from .LLMExceptions import LLMRateLimitError
+from utils import logging
+logger = logging.get_logger(__name__)
+
+
+class RateBudget:
+    """
+    token bucket refilled continuously up to `per_minute` units, a budget of 0 means unlimited
+    """
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self.available = float(per_minute)
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, amount: int = 1):
+        if not self.per_minute:
+            return
+
+        # a single request larger than the whole budget may still go through once the bucket is full
+        amount = min(amount, self.per_minute)
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.available = min(self.per_minute,
+                                     self.available + (now - self.updated_at) * self.per_minute / 60)
+                self.updated_at = now
+
+                if self.available >= amount:
+                    self.available -= amount
+                    return
+
+                await asyncio.sleep((amount - self.available) * 60 / self.per_minute)
+
+
+class EmbeddingScheduler(LLMWrapper):
+    """
+    wraps an embedding provider with bounded concurrency, request/token budgets and
+    rate-limit aware retries, every other call is forwarded to the wrapped provider
+    """
+    def __init__(self, client: LLMInterface,
+                       max_concurrency: int = 4,
+                       requests_per_minute: int = 0,
+                       tokens_per_minute: int = 0,
+                       max_retries: int = 5,
+                       initial_backoff: float = 1.0,
+                       max_backoff: float = 60.0):
+
+        super().__init__(client=client)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.request_budget = RateBudget(per_minute=requests_per_minute)
+        self.token_budget = RateBudget(per_minute=tokens_per_minute)
+
+        # shared across calls, the provider is throttled as a whole
+        self.paused_until = 0.0
+        self.backoff = initial_backoff
+
+        self.queued = 0
+        self.in_flight = 0
+        self.throttled = 0
+        self.retried = 0
+        self.completed = 0
+        self.failed = 0
+
+    async def embed_many(self, texts: List[str], document_type: str = None):
+        batches = self.client.split_batches(texts=texts,
+                                            max_batch_size=self.client.EMBED_MAX_BATCH_SIZE,
+                                            max_batch_characters=self.client.EMBED_MAX_BATCH_CHARACTERS)
+
+        results = await asyncio.gather(*[
+            self.run_batch(batch=batch, document_type=document_type)
+            for batch in batches
+        ])
+
+        if any(vectors is None for vectors in results):
+            return None
+        return self.stack_vectors(results)
+
+    async def run_batch(self, batch: List[str], document_type: str = None):
+        self.queued += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.in_flight += 1
+        try:
+            return await self.dispatch(batch=batch, document_type=document_type)
+        finally:
+            self.in_flight -= 1
+            self.semaphore.release()
+
+    async def dispatch(self, batch: List[str], document_type: str = None):
+        for attempt in range(self.max_retries + 1):
+            await self.wait_for_pause()
+            await self.request_budget.acquire(1)
+            await self.token_budget.acquire(self.estimate_tokens(batch))
+
+            try:
+                vectors = await self.client.embed_many(texts=batch, document_type=document_type)
+            except LLMRateLimitError as e:
+                self.throttled += 1
+                delay = self.register_throttle(retry_after=e.retry_after)
+                if attempt == self.max_retries:
+                    break
+
+                self.retried += 1
+                logger.warning(f"Embedding request throttled, retrying in {delay:.1f}s "
+                               f"(attempt {attempt + 1}/{self.max_retries})")
+                continue
+
+            self.backoff = self.initial_backoff
+            if vectors is None:
+                self.failed += 1
+            else:
+                self.completed += 1
+            return vectors
+
+        self.failed += 1
+        logger.error(f"Embedding request still throttled after {self.max_retries} retries")
+        return None
+
+    async def wait_for_pause(self):
+        delay = self.paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def register_throttle(self, retry_after: float = None) -> float:
+        # honor the vendor hint, otherwise back off exponentially with jitter
+        if retry_after is not None:
+            delay = retry_after
+        else:
+            delay = self.backoff * (1 + random.random() / 2)
+            self.backoff = min(self.backoff * 2, self.max_backoff)
+
+        delay = min(delay, self.max_backoff)
+        self.paused_until = max(self.paused_until, time.monotonic() + delay)
+        return delay
+
+    @staticmethod
+    def estimate_tokens(texts: List[str]) -> int:
+        # ~4 characters per token is close enough for budgeting
+        return max(1, sum(len(text) for text in texts) // 4)
+
+    def get_stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "throttled": self.throttled,
+            "retried": self.retried,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
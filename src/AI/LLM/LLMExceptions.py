@@ -0,0 +1,28 @@
+from typing import Optional
+
+class LLMRateLimitError(Exception):
+    """
+    raised by a provider when the vendor throttles a request (HTTP 429)
+    """
+    def __init__(self, provider: str, retry_after: Optional[str] = None):
+        self.provider = provider
+        self.retry_after = self.parse_retry_after(retry_after)
+        super().__init__(f"{provider} rate limit reached, retry after {self.retry_after} seconds")
+
+    @staticmethod
+    def parse_retry_after(retry_after) -> Optional[float]:
+        try:
+            return max(float(retry_after), 0.0) if retry_after is not None else None
+        except (TypeError, ValueError):
+            # HTTP-date form is not worth parsing, fall back to the scheduler backoff
+            return None
+
+
+class LLMStreamError(Exception):
+    """
+    raised by a provider when the upstream stream breaks after it started, the text generated
+    so far is a truncated answer
+    """
+    def __init__(self, provider: str):
+        self.provider = provider
+        super().__init__(f"{provider} stream ended before the answer was complete")
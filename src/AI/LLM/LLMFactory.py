@@ -1,6 +1,6 @@
 
 from .LLMEnums import LLMModel
-from .providers import OpenAIProvider, CoHereProvider, GeminiProvider
+from . import providers
 from utils.app_enums import ResponseSignals
 
 class LLMProviderFactory:
@@ -8,8 +8,9 @@ class LLMProviderFactory:
         self.config = config
 
     def create(self, provider: str):
+        # only the selected provider module (and its SDK) gets imported
         if provider == LLMModel.OPENAI.value:
-            return OpenAIProvider(
+            return providers.OpenAIProvider(
                 api_key = self.config.OPENAI_API_KEY,
                 default_max_input_characters=self.config.DEFAULT_MAX_INPUT_CHARACTERS,
                 default_max_output_tokens=self.config.DEFAULT_MAX_TOKENS,
@@ -17,7 +18,7 @@ class LLMProviderFactory:
             )
 
         if provider == LLMModel.COHERE.value:
-            return CoHereProvider(
+            return providers.CoHereProvider(
                 api_key = self.config.COHERE_API_KEY,
                 default_max_input_characters=self.config.DEFAULT_MAX_INPUT_CHARACTERS,
                 default_max_output_tokens=self.config.DEFAULT_MAX_TOKENS,
@@ -25,7 +26,7 @@ class LLMProviderFactory:
             )
         
         if provider == LLMModel.GEMINI.value:
-            return GeminiProvider(
+            return providers.GeminiProvider(
                 api_key=self.config.GEMINI_API_KEY,
                 default_max_input_characters=self.config.DEFAULT_MAX_INPUT_CHARACTERS,
                 default_max_output_tokens=self.config.DEFAULT_MAX_TOKENS,
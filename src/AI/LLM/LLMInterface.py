@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator, List
+import numpy as np
 
 class LLMInterface(ABC):
 
@@ -19,10 +21,50 @@ class LLMInterface(ABC):
                             temperature: float = None):
         pass
 
+    @abstractmethod
+    def generate_stream(self, user_prompt: str, system_prompt: str, max_output_tokens: int=None,
+                            temperature: float = None) -> AsyncIterator[str]:
+        """
+        async generator yielding the answer text piece by piece as the model produces it
+        """
+        pass
+
     @abstractmethod
     async def embed(self, text: str, document_type: str = None):
         pass
 
+    @abstractmethod
+    async def embed_many(self, texts: List[str], document_type: str = None):
+        pass
+
     @abstractmethod
     async def construct_prompt(self, prompt: str, role: str):
         pass
+
+    def split_batches(self, texts: List[str], max_batch_size: int, max_batch_characters: int) -> List[List[str]]:
+        """
+        split texts into consecutive batches bounded by the provider item count and payload size limits
+        """
+        batches, batch, batch_characters = [], [], 0
+        for text in texts:
+            if batch and (len(batch) >= max_batch_size or batch_characters + len(text) > max_batch_characters):
+                batches.append(batch)
+                batch, batch_characters = [], 0
+
+            batch.append(text)
+            batch_characters += len(text)
+
+        if batch:
+            batches.append(batch)
+        return batches
+
+    @staticmethod
+    def stack_vectors(batches: List[np.ndarray]) -> np.ndarray:
+        """
+        one contiguous float32 (texts, embedding size) matrix from the vectors of consecutive batches
+        """
+        if not batches:
+            return np.empty((0, 0), dtype=np.float32)
+        if len(batches) == 1:
+            return batches[0]
+        return np.concatenate(batches)
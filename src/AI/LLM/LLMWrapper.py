@@ -0,0 +1,46 @@
+from typing import List
+from .LLMInterface import LLMInterface
+
+
+class LLMWrapper(LLMInterface):
+    """
+    base of the clients layered in front of a provider, every call is forwarded to the wrapped
+    client unless a subclass overrides it
+    """
+    def __init__(self, client: LLMInterface):
+        self.client = client
+
+    def __getattr__(self, name):
+        # expose provider attributes such as embedding_size and the batch limits
+        return getattr(self.client, name)
+
+    def set_generation_model(self, model_id: str):
+        self.client.set_generation_model(model_id=model_id)
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.client.set_embedding_model(model_id=model_id, embedding_size=embedding_size)
+
+    async def process_text(self, text: str):
+        return await self.client.process_text(text)
+
+    async def generate(self, user_prompt: str, system_prompt: str, max_output_tokens: int=None,
+                            temperature: float = None):
+        return await self.client.generate(user_prompt=user_prompt, system_prompt=system_prompt,
+                                          max_output_tokens=max_output_tokens, temperature=temperature)
+
+    def generate_stream(self, user_prompt: str, system_prompt: str, max_output_tokens: int=None,
+                            temperature: float = None):
+        return self.client.generate_stream(user_prompt=user_prompt, system_prompt=system_prompt,
+                                           max_output_tokens=max_output_tokens, temperature=temperature)
+
+    async def construct_prompt(self, prompt: str, role: str):
+        return await self.client.construct_prompt(prompt=prompt, role=role)
+
+    async def embed(self, text: str, document_type: str = None):
+        vectors = await self.embed_many(texts=[text], document_type=document_type)
+        if vectors is None or len(vectors) == 0:
+            return None
+        return vectors[0]
+
+    async def embed_many(self, texts: List[str], document_type: str = None):
+        return await self.client.embed_many(texts=texts, document_type=document_type)
@@ -1,4 +1,15 @@
+import importlib
 from .LLMInterface import LLMInterface
 from .LLMEnums import LLMModel, OpenAIEnums, CoHereEnums, DocumentTypeEnum
-from .providers import OpenAIProvider, CoHereProvider
-from .LLMFactory import LLMProviderFactory
\ No newline at end of file
+from .LLMFactory import LLMProviderFactory
+from .LLMWrapper import LLMWrapper
+from .EmbeddingScheduler import EmbeddingScheduler
+from .LLMExceptions import LLMRateLimitError, LLMStreamError
+from .EmbeddingCache import EmbeddingCache
+
+def __getattr__(name):
+    # provider classes are re-exported lazily, see providers/__init__.py
+    providers = importlib.import_module(".providers", __name__)
+    if name not in providers.PROVIDER_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(providers, name)
@@ -1,9 +1,15 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import CoHereEnums, DocumentTypeEnum
+from ..LLMExceptions import LLMRateLimitError, LLMStreamError
 import cohere
+from typing import List
+import numpy as np
 from utils import logging
 
 class CoHereProvider(LLMInterface):
+    # limits of a single embed request (96 texts per call)
+    EMBED_MAX_BATCH_SIZE = 96
+    EMBED_MAX_BATCH_CHARACTERS = 500_000
 
     def __init__(self, api_key: str,
                        default_max_input_characters: int=1000,
@@ -11,7 +17,7 @@ class CoHereProvider(LLMInterface):
                        default_temperature: float=0.1):
 
         self.api_key = api_key
-        self.client = cohere.Client(api_key=self.api_key)
+        self.client = cohere.AsyncClient(api_key=self.api_key)
 
         self.default_max_input_characters = default_max_input_characters
         self.default_max_output_tokens = default_max_output_tokens
@@ -49,7 +55,7 @@ class CoHereProvider(LLMInterface):
                 prompt=system_prompt,
                 role=self.enums.SYSTEM.value
             )]
-            response = self.client.chat(
+            response = await self.client.chat(
                 model=self.generation_model_id,
                 chat_history=chat_history,
                 message=await self.process_text(user_prompt),
@@ -67,7 +73,42 @@ class CoHereProvider(LLMInterface):
             self.logger.error(f"Error in chat completion with CoHere: {str(e)}")
             return None
 
+    async def generate_stream(self, user_prompt: str, system_prompt: str, max_output_tokens: int=None,
+                              temperature: float = None):
+
+        if not self.client:
+            self.logger.error("CoHere client was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere was not set")
+            return
+
+        events = self.client.chat_stream(
+            model=self.generation_model_id,
+            chat_history=[await self.construct_prompt(prompt=system_prompt, role=self.enums.SYSTEM.value)],
+            message=await self.process_text(user_prompt),
+            temperature=temperature or self.default_temperature,
+            max_tokens=max_output_tokens or self.default_max_output_tokens,
+        )
+        try:
+            async for event in events:
+                if event.event_type == "text-generation" and event.text:
+                    yield event.text
+        except Exception as e:
+            self.logger.error(f"Error in streaming chat completion with CoHere: {str(e)}")
+            raise LLMStreamError(provider="cohere") from e
+        finally:
+            # stops the upstream generation when the consumer goes away early
+            await events.aclose()
+
     async def embed(self, text: str, document_type: str = None):
+        vectors = await self.embed_many(texts=[text], document_type=document_type)
+        if vectors is None or len(vectors) == 0:
+            return None
+        return vectors[0]
+
+    async def embed_many(self, texts: List[str], document_type: str = None):
         if not self.client:
             self.logger.error("CoHere client was not set")
             return None
@@ -77,29 +118,42 @@ class CoHereProvider(LLMInterface):
             return None
         
         try: 
-            input_type = CoHereEnums.DOCUMENT
-            if document_type == DocumentTypeEnum.QUERY:
-                input_type = CoHereEnums.QUERY
-
-            response = self.client.embed(
-                model = self.embedding_model_id,
-                texts = [self.process_text(text)],
-                input_type = input_type,
-                embedding_types=['float'],
-            )
-
-            if not response or not response.embeddings or not response.embeddings.float:
-                self.logger.error("Error while embedding text with CoHere")
-                return None
-            
-            return response.embeddings.float[0]
+            input_type = CoHereEnums.DOCUMENT.value
+            if document_type == DocumentTypeEnum.QUERY.value:
+                input_type = CoHereEnums.QUERY.value
+
+            texts = [await self.process_text(text) for text in texts]
+
+            vectors = []
+            for batch in self.split_batches(texts=texts,
+                                            max_batch_size=self.EMBED_MAX_BATCH_SIZE,
+                                            max_batch_characters=self.EMBED_MAX_BATCH_CHARACTERS):
+                response = await self.client.embed(
+                    model = self.embedding_model_id,
+                    texts = batch,
+                    input_type = input_type,
+                    embedding_types=['float'],
+                )
+
+                if not response or not response.embeddings or not response.embeddings.float \
+                        or len(response.embeddings.float) != len(batch):
+                    self.logger.error("Error while embedding texts with CoHere")
+                    return None
+
+                vectors.append(np.asarray(response.embeddings.float, dtype=np.float32))
+
+            return self.stack_vectors(vectors)
+
+        except cohere.TooManyRequestsError as e:
+            self.logger.warning("CoHere embedding request was rate limited")
+            raise LLMRateLimitError(provider="cohere") from e
         
         except Exception as e:
-            self.logger.error(f"Error embedding text with CoHere: {str(e)}")
+            self.logger.error(f"Error embedding texts with CoHere: {str(e)}")
             return None
     
     async def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
-            "text": self.process_text(prompt)
+            "text": await self.process_text(prompt)
         }
\ No newline at end of file
@@ -1,11 +1,19 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import GeminiEnums, DocumentTypeEnum
+from ..LLMExceptions import LLMRateLimitError, LLMStreamError
 from google import genai
 from google.genai.types import EmbedContentConfig, GenerateContentConfig
+from google.genai.errors import APIError
+from typing import List
+import numpy as np
 
 from utils import logging
 
 class GeminiProvider(LLMInterface):
+    # limits of a single batchEmbedContents request (100 contents)
+    EMBED_MAX_BATCH_SIZE = 100
+    EMBED_MAX_BATCH_CHARACTERS = 400_000
+
     def __init__(self, api_key: str,
                  default_max_input_characters: int=1000,
                  default_max_output_tokens: int=1000,
@@ -67,7 +75,50 @@ class GeminiProvider(LLMInterface):
             self.logger.error(f"Error in chat completion with Gemini: {str(e)}")
             return None
     
+    async def generate_stream(self, user_prompt: str, system_prompt: str, max_output_tokens: int=None,
+                              temperature: float=None):
+        if self.client is None:
+            self.logger.error("Gemini client is not initialized.")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for Gemini was not set")
+            return
+
+        try:
+            config = GenerateContentConfig(
+                system_instruction=system_prompt,
+                temperature=temperature or self.default_temperature,
+                max_output_tokens=max_output_tokens or self.default_max_output_tokens,
+            )
+
+            chat = self.client.aio.chats.create(model=self.generation_model_id)
+            chunks = await chat.send_message_stream(
+                message=user_prompt,
+                config=config
+            )
+        except Exception as e:
+            self.logger.error(f"Error in streaming chat completion with Gemini: {str(e)}")
+            return
+
+        try:
+            async for chunk in chunks:
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            self.logger.error(f"Error while streaming text from Gemini: {str(e)}")
+            raise LLMStreamError(provider="gemini") from e
+        finally:
+            # stops the upstream generation when the consumer goes away early
+            await chunks.aclose()
+
     async def embed(self, text: str, document_type: str = None):
+        vectors = await self.embed_many(texts=[text], document_type=document_type)
+        if vectors is None or len(vectors) == 0:
+            return None
+        return vectors[0]
+
+    async def embed_many(self, texts: List[str], document_type: str = None):
         if self.client is None:
             self.logger.error("Gemini client is not initialized.")
             return None
@@ -84,24 +135,39 @@ class GeminiProvider(LLMInterface):
             config = EmbedContentConfig(task_type=task_type, 
                                         output_dimensionality=self.embedding_size)
 
-            results = await self.client.aio.models.embed_content(
-                model=self.embedding_model_id,
-                contents=text,
-                config=config
-            )
+            vectors = []
+            for batch in self.split_batches(texts=texts,
+                                            max_batch_size=self.EMBED_MAX_BATCH_SIZE,
+                                            max_batch_characters=self.EMBED_MAX_BATCH_CHARACTERS):
+                results = await self.client.aio.models.embed_content(
+                    model=self.embedding_model_id,
+                    contents=batch,
+                    config=config
+                )
+
+                if not results or not results.embeddings or len(results.embeddings) != len(batch):
+                    self.logger.error("Error while embedding texts with Gemini")
+                    return None
+
+                vectors.append(np.asarray([embedding.values for embedding in results.embeddings], dtype=np.float32))
+
+            return self.stack_vectors(vectors)
 
-            if not results:
-                self.logger.error("Error while embedding text with Gemini")
+        except APIError as e:
+            if e.code != 429:
+                self.logger.error(f"Error embedding texts with Gemini: {str(e)}")
                 return None
 
-            return results.embeddings[0].values
+            self.logger.warning("Gemini embedding request was rate limited")
+            headers = getattr(e.response, "headers", None) or {}
+            raise LLMRateLimitError(provider="gemini", retry_after=headers.get("retry-after")) from e
 
         except Exception as e:
-            self.logger.error(f"Error embedding text with Gemini: {str(e)}")
+            self.logger.error(f"Error embedding texts with Gemini: {str(e)}")
             return None
 
     async def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
-            "parts": [self.process_text(prompt)]
+            "parts": [await self.process_text(prompt)]
         }
\ No newline at end of file
@@ -1,17 +1,24 @@
-from openai import OpenAI
+from openai import AsyncOpenAI, RateLimitError
+from typing import List
+import numpy as np
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import OpenAIEnums
+from ..LLMExceptions import LLMRateLimitError, LLMStreamError
 from utils import logging
 
 
 class OpenAIProvider(LLMInterface):
+    # limits of a single embeddings request (2048 inputs, ~300k tokens)
+    EMBED_MAX_BATCH_SIZE = 2048
+    EMBED_MAX_BATCH_CHARACTERS = 800_000
+
     def __init__(self, api_key: str,
                 default_max_input_characters: int = 1000, 
                 default_max_output_tokens: int=1000,
                 default_temperature: float = 0.5):
         
         self.api_key = api_key
-        self.client = OpenAI(api_key=api_key)
+        self.client = AsyncOpenAI(api_key=api_key)
 
         self.default_max_input_characters = default_max_input_characters
         self.default_max_output_tokens = default_max_output_tokens
@@ -56,7 +63,7 @@ class OpenAIProvider(LLMInterface):
                 )
             ]
         
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model= self.generation_model_id,
                 messages= messages,
                 max_tokens= max_output_tokens or self.default_max_output_tokens,
@@ -73,7 +80,46 @@ class OpenAIProvider(LLMInterface):
             self.logger.error(f"Error in chat completion with OpenAI: {str(e)}")
             return None
 
+    async def generate_stream(self, user_prompt: str, system_prompt: str, max_output_tokens: int = None,
+                              temperature: float = None):
+
+        if self.generation_model_id is None:
+            self.logger.error("Generation model ID is not set.")
+            return
+
+        try:
+            stream = await self.client.chat.completions.create(
+                model= self.generation_model_id,
+                messages= [
+                    await self.construct_prompt(prompt=system_prompt, role=self.enums.SYSTEM.value),
+                    await self.construct_prompt(prompt=user_prompt, role=self.enums.USER.value),
+                ],
+                max_tokens= max_output_tokens or self.default_max_output_tokens,
+                temperature= temperature or self.default_temperature,
+                stream= True,
+            )
+        except Exception as e:
+            self.logger.error(f"Error in streaming chat completion with OpenAI: {str(e)}")
+            return
+
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            self.logger.error(f"Error while streaming text from OpenAI: {str(e)}")
+            raise LLMStreamError(provider="openai") from e
+        finally:
+            # stops the upstream generation when the consumer goes away early
+            await stream.close()
+
     async def embed(self, text: str, document_type: str = None):
+        vectors = await self.embed_many(texts=[text], document_type=document_type)
+        if vectors is None or len(vectors) == 0:
+            return None
+        return vectors[0]
+
+    async def embed_many(self, texts: List[str], document_type: str = None):
         if self.embedding_model_id is None:
             self.logger.error("Embedding model ID is not set.")
             return None
@@ -81,25 +127,37 @@ class OpenAIProvider(LLMInterface):
         if self.client is None:
             self.logger.error("OpenAI client is not initialized.")
             return None
-        try: 
-            response = self.client.embeddings.create(
-                input=text,
-                model=self.embedding_model_id,
-                dimensions=self.embedding_size
-            )
+        try:
+            vectors = []
+            for batch in self.split_batches(texts=texts,
+                                            max_batch_size=self.EMBED_MAX_BATCH_SIZE,
+                                            max_batch_characters=self.EMBED_MAX_BATCH_CHARACTERS):
+                response = await self.client.embeddings.create(
+                    input=batch,
+                    model=self.embedding_model_id,
+                    dimensions=self.embedding_size
+                )
+
+                if not response or not response.data or len(response.data) != len(batch):
+                    self.logger.error("Error while embedding texts with OpenAI")
+                    return None
+
+                data = sorted(response.data, key=lambda item: item.index)
+                vectors.append(np.asarray([item.embedding for item in data], dtype=np.float32))
+
+            # the python floats of a response live for one batch, what goes down the pipeline is float32
+            return self.stack_vectors(vectors)
+
+        except RateLimitError as e:
+            self.logger.warning("OpenAI embedding request was rate limited")
+            raise LLMRateLimitError(provider="openai", retry_after=e.response.headers.get("retry-after")) from e
 
-            if not response or not response.data or len(response.data) == 0 or not response.data[0].embedding:
-                self.logger.error("Error while embedding text with OpenAI")
-                return None
-            
-            return response.data[0].embedding
-        
         except Exception as e:
-            self.logger.error(f"Error embedding text with OpenAI: {str(e)}")
+            self.logger.error(f"Error embedding texts with OpenAI: {str(e)}")
             return None
 
     async def construct_prompt(self, prompt: str, role: str):
-        return [{
+        return {
             "role": role,
             "content": prompt
-        }]
\ No newline at end of file
+        }
\ No newline at end of file
@@ -1,3 +1,20 @@
-from .CoHereProvider import CoHereProvider
-from .OpenAIProvider import OpenAIProvider
-from .GeminiProvider import GeminiProvider
\ No newline at end of file
+import importlib
+from utils.startup_timing import startup_timer
+
+# each provider module pulls in its vendor SDK, so it is only imported once a factory asks for it
+PROVIDER_MODULES = {
+    "OpenAIProvider": ".OpenAIProvider",
+    "CoHereProvider": ".CoHereProvider",
+    "GeminiProvider": ".GeminiProvider",
+}
+
+def __getattr__(name):
+    if name not in PROVIDER_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    with startup_timer.measure("import", f"{__name__}{PROVIDER_MODULES[name]}"):
+        module = importlib.import_module(PROVIDER_MODULES[name], __name__)
+
+    provider = getattr(module, name)
+    globals()[name] = provider
+    return provider
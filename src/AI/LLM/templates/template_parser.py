@@ -1,4 +1,9 @@
 import os
+import hashlib
+import importlib
+from string import Template
+from types import MappingProxyType
+from typing import List
 
 class TemplateParser:
 
@@ -7,36 +12,76 @@ class TemplateParser:
         self.default_language = default_language
         self.language = None
 
+        # every locale is loaded once, lookups never touch the filesystem again
+        self.locales = self.load_locales()
+        self.templates = MappingProxyType({})
+
         self.set_language(language)
-    
-    def set_language(self, language: str):
-        if not language:
-            self.language = self.default_language
 
-        language_path = os.path.join(self.current_path, "locales", language)
-        if os.path.exists(language_path):
+    def load_locales(self):
+        """
+        import every group module of every language under locales/ and keep their templates,
+        keyed by (group, key), in read-only mappings
+        """
+        locales_path = os.path.join(self.current_path, "locales")
+        locales = {}
+        for language in sorted(os.listdir(locales_path)):
+            language_path = os.path.join(locales_path, language)
+            if not os.path.isdir(language_path) or language.startswith("__"):
+                continue
+
+            templates = {}
+            for file_name in sorted(os.listdir(language_path)):
+                if not file_name.endswith(".py") or file_name.startswith("__"):
+                    continue
+
+                group = file_name[:-len(".py")]
+                module = importlib.import_module(f"{__package__}.locales.{language}.{group}")
+                for key, value in vars(module).items():
+                    if isinstance(value, Template):
+                        templates[(group, key)] = value
+
+            locales[language] = MappingProxyType(templates)
+        return MappingProxyType(locales)
+
+    def set_language(self, language: str):
+        if language in self.locales:
             self.language = language
         else:
             self.language = self.default_language
 
+        # the fallback is resolved here once: keys missing in the language come from the default one
+        templates = dict(self.locales.get(self.default_language, {}))
+        templates.update(self.locales.get(self.language, {}))
+        self.templates = MappingProxyType(templates)
+
+        self.version = self.compute_version()
+
+    def compute_version(self):
+        """
+        short hash of the templates in use, so anything derived from rendered prompts can be keyed by it
+        """
+        digest = hashlib.sha256()
+        for (group, key), template in sorted(self.templates.items()):
+            digest.update(f"{group}.{key}={template.template}\0".encode("utf-8"))
+        return digest.hexdigest()[:12]
+
     def get(self, group: str, key: str, vars: dict={}):
         if not group or not key:
             return None
-        
-        group_path = os.path.join(self.current_path, "locales", self.language, f"{group}.py" )
-        targeted_language = self.language
-        if not os.path.exists(group_path):
-            group_path = os.path.join(self.current_path, "locales", self.default_language, f"{group}.py" )
-            targeted_language = self.default_language
-
-        if not os.path.exists(group_path):
+
+        template = self.templates.get((group, key))
+        if template is None:
             return None
-        
-        # import group module
-        module = __import__(f"AI.LLM.templates.locales.{targeted_language}.{group}", fromlist=[group])
 
-        if not module:
+        return template.substitute(vars)
+
+    def render_many(self, group: str, key: str, vars_list: List[dict], separator: str = "\n"):
+        """
+        render one template for every item of vars_list (e.g. all retrieved documents) in a single call
+        """
+        template = self.templates.get((group, key))
+        if template is None:
             return None
-        
-        key_attribute = getattr(module, key)
-        return key_attribute.substitute(vars)
\ No newline at end of file
+
+        return separator.join(template.substitute(vars) for vars in vars_list)
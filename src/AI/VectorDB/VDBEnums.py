@@ -1,4 +1,23 @@
 from enum import Enum
 
 class VectorDBType(Enum):
-    QDRANT = "qdrant"
\ No newline at end of file
+    QDRANT = "qdrant"
+    NUMPY = "numpy"
+
+class VectorDBStorageMode(Enum):
+    # one collection per video
+    PER_VIDEO = "per_video"
+    # every video in one collection, filtered by an indexed video_id payload field
+    SHARED = "shared"
+
+class VectorDBCollectionProfile(Enum):
+    # float32 vectors in RAM
+    DEFAULT = "default"
+    # int8 copy (4x smaller) searched first, float32 kept in RAM for rescoring
+    SCALAR_INT8 = "scalar_int8"
+    # 1 bit per dimension (32x smaller) searched first, float32 kept in RAM for rescoring
+    BINARY = "binary"
+    # float32 on disk, only the int8 copy and the graph in RAM
+    ON_DISK_INT8 = "on_disk_int8"
+    # float32 on disk, only the binary copy and the graph in RAM
+    ON_DISK_BINARY = "on_disk_binary"
@@ -0,0 +1,17 @@
+class CollectionNotFoundError(Exception):
+    """
+    raised by a provider when an operation targets a collection that does not exist
+    """
+    def __init__(self, collection_name: str):
+        self.collection_name = collection_name
+        super().__init__(f"Collection '{collection_name}' does not exist")
+
+
+class UnsupportedStorageModeError(Exception):
+    """
+    raised by a provider when an operation needs a different storage mode than the configured one
+    """
+    def __init__(self, operation: str, storage_mode: str):
+        self.operation = operation
+        self.storage_mode = storage_mode
+        super().__init__(f"'{operation}' is not supported in the '{storage_mode}' storage mode")
@@ -1,5 +1,5 @@
-from .providers import QdrantProvider
-from .VDBEnums import VectorDBType
+from . import providers
+from .VDBEnums import VectorDBType, VectorDBStorageMode
 from utils.app_enums import ResponseSignals
 
 class VDBFactory:
@@ -8,11 +8,34 @@ class VDBFactory:
 
     def create(self, provider: str):
         if provider == VectorDBType.QDRANT.value:
-            return QdrantProvider(
+            return providers.QdrantProvider(
                 host= self.config.VECTOR_DB_HOST,
                 port= self.config.VECTOR_DB_PORT,
                 grpc_port= self.config.VECTOR_DB_GRPC_PORT,
                 distance_metric= self.config.VECTOR_DB_DISTANCE_METHOD,
+                prefer_grpc= bool(self.config.VECTOR_DB_PREFER_GRPC),
+                timeout= self.config.VECTOR_DB_TIMEOUT_SECONDS,
+                max_connections= self.config.VECTOR_DB_MAX_CONNECTIONS,
+                storage_mode= self.config.VECTOR_DB_STORAGE_MODE,
+                shared_collection_name= self.config.VECTOR_DB_SHARED_COLLECTION,
+                shard_number= self.config.VECTOR_DB_SHARD_NUMBER,
+                collection_profile= self.config.VECTOR_DB_COLLECTION_PROFILE,
+                hnsw_m= self.config.VECTOR_DB_HNSW_M,
+                hnsw_ef_construct= self.config.VECTOR_DB_HNSW_EF_CONSTRUCT,
+                hnsw_ef= self.config.VECTOR_DB_HNSW_EF,
+                rescore_oversampling= self.config.VECTOR_DB_RESCORE_OVERSAMPLING,
+                coarse_size= self.config.VECTOR_DB_COARSE_SIZE,
+                coarse_oversampling= self.config.VECTOR_DB_COARSE_OVERSAMPLING,
+            )
+        elif provider == VectorDBType.NUMPY.value:
+            # one memory mapped matrix per video, there is no shared collection to search across videos
+            if self.config.VECTOR_DB_STORAGE_MODE != VectorDBStorageMode.PER_VIDEO.value:
+                raise ValueError(f"The '{VectorDBType.NUMPY.value}' vector db backend only supports the "
+                                 f"'{VectorDBStorageMode.PER_VIDEO.value}' storage mode, "
+                                 f"got VECTOR_DB_STORAGE_MODE='{self.config.VECTOR_DB_STORAGE_MODE}'")
+            return providers.NumpyProvider(
+                path= self.config.VECTOR_DB_PATH,
+                distance_metric= self.config.VECTOR_DB_DISTANCE_METHOD,
             )
         else:
             raise ValueError(ResponseSignals.UNSUPPORTED_VDB_PROVIDER.value)
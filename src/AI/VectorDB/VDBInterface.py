@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import List
-from models.db_schemas import RetrievedDocument
+from datetime import datetime
+from models.db_schemas import RetrievedDocument, RetrievedVideo
 
 class VectorDBInterface(ABC):
 
@@ -41,10 +42,23 @@ class VectorDBInterface(ABC):
 
     @abstractmethod
     async def insert_many(self, collection_name: str, texts: list,
-                          vectors: list, record_ids: list = None, batch_size: int = 50):
+                          vectors: list, mongodb_ids: list = None, metadatas: list = None,
+                          batch_size: int = 50):
         pass
 
     @abstractmethod
-    async def search(self, collection_name: str, vector: list, limit: int) -> List[RetrievedDocument]:
+    async def search(self, collection_name: str, vector: list, limit: int,
+                     hnsw_ef: int = None, exact: bool = False) -> List[RetrievedDocument]:
+        pass
+
+    @abstractmethod
+    async def search_videos(self, query_vector: list, limit: int = 10, group_size: int = 3,
+                            video_ids: List[str] = None, authors: List[str] = None,
+                            published_after: datetime = None,
+                            published_before: datetime = None) -> List[RetrievedVideo]:
+        pass
+
+    @abstractmethod
+    async def get_memory_report(self, limit: int = 100) -> dict:
         pass
     
\ No newline at end of file
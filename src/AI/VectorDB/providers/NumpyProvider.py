@@ -0,0 +1,372 @@
+import asyncio
+import json
+import os
+import shutil
+import uuid
+import numpy as np
+from ..VDBInterface import VectorDBInterface
+from ..VDBExceptions import CollectionNotFoundError, UnsupportedStorageModeError
+from ..VDBEnums import VectorDBStorageMode
+from models.db_schemas import RetrievedDocument
+from typing import List
+from utils.thread_pool import run_blocking
+from utils.logging import get_logger
+logger = get_logger(__name__)
+
+
+class MemmapCollection:
+    """
+    one collection on disk: a float32 matrix in vectors.f32 (memory mapped, grown by doubling),
+    the payload of every row in payloads.jsonl (appended, the last line of an id wins) and
+    the size and distance in meta.json
+    """
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, path: str, embedding_size: int, normalize: bool):
+        self.path = path
+        self.embedding_size = embedding_size
+        self.normalize = normalize
+
+        self.count = 0
+        self.capacity = 0
+        self.matrix = None
+        self.ids = []
+        self.rows = {}
+        self.payloads = []
+
+    @property
+    def vectors_path(self):
+        return os.path.join(self.path, "vectors.f32")
+
+    @property
+    def payloads_path(self):
+        return os.path.join(self.path, "payloads.jsonl")
+
+    @property
+    def meta_path(self):
+        return os.path.join(self.path, "meta.json")
+
+    @classmethod
+    def create(cls, path: str, embedding_size: int, normalize: bool):
+        os.makedirs(path, exist_ok=True)
+        collection = cls(path=path, embedding_size=embedding_size, normalize=normalize)
+        open(collection.payloads_path, "w", encoding="utf-8").close()
+        collection.resize(cls.INITIAL_CAPACITY)
+        collection.write_meta()
+        return collection
+
+    @classmethod
+    def open(cls, path: str):
+        with open(os.path.join(path, "meta.json")) as meta_file:
+            meta = json.load(meta_file)
+
+        collection = cls(path=path, embedding_size=meta["embedding_size"], normalize=meta["normalize"])
+        valid_size = 0
+        with open(collection.payloads_path, "rb") as payloads_file:
+            for line in payloads_file:
+                if not line.endswith(b"\n"):
+                    # a crash in the middle of an append leaves a partial last line that does not
+                    # parse, the insert it belongs to never completed, so the line is cut off and
+                    # the next append starts on a fresh line
+                    break
+
+                record = json.loads(line.decode("utf-8"))
+                valid_size += len(line)
+                row = record["row"]
+                if row == len(collection.ids):
+                    collection.ids.append(record["id"])
+                    collection.payloads.append(record["payload"])
+                else:
+                    collection.payloads[row] = record["payload"]
+                collection.rows[record["id"]] = row
+
+        if valid_size != os.path.getsize(collection.payloads_path):
+            logger.warning(f"Dropping the partial last payload line of collection '{path}'.")
+            with open(collection.payloads_path, "r+b") as payloads_file:
+                payloads_file.truncate(valid_size)
+
+        # rows past the last payload line were written by an interrupted insert and are dropped
+        collection.count = len(collection.ids)
+        collection.capacity = os.path.getsize(collection.vectors_path) // (4 * collection.embedding_size)
+        collection.matrix = np.memmap(collection.vectors_path, dtype=np.float32, mode="r+",
+                                      shape=(collection.capacity, collection.embedding_size))
+        return collection
+
+    def write_meta(self):
+        with open(self.meta_path, "w") as meta_file:
+            json.dump({"embedding_size": self.embedding_size, "normalize": self.normalize}, meta_file)
+
+    def resize(self, capacity: int):
+        if self.matrix is not None:
+            self.matrix.flush()
+
+        # the file only grows, so searches still holding the previous mapping stay valid
+        with open(self.vectors_path, "ab") as vectors_file:
+            vectors_file.truncate(capacity * self.embedding_size * 4)
+        self.matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r+",
+                                shape=(capacity, self.embedding_size))
+        self.capacity = capacity
+
+    def upsert(self, ids: List[str], vectors: List[List[float]], payloads: List[dict]):
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.embedding_size)
+        if self.normalize:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.maximum(norms, np.finfo(np.float32).tiny)
+
+        rows = dict(self.rows)
+        new_ids = []
+        for point_id in ids:
+            if point_id not in rows:
+                rows[point_id] = self.count + len(new_ids)
+                new_ids.append(point_id)
+
+        if self.count + len(new_ids) > self.capacity:
+            capacity = self.capacity
+            while self.count + len(new_ids) > capacity:
+                capacity *= 2
+            self.resize(capacity)
+
+        row_numbers = [rows[point_id] for point_id in ids]
+        self.matrix[row_numbers] = vectors
+
+        # vectors reach the disk before the payload lines that make their rows visible
+        self.matrix.flush()
+        with open(self.payloads_path, "a", encoding="utf-8") as payloads_file:
+            payloads_file.write("".join(
+                json.dumps({"row": row, "id": point_id, "payload": payload}, ensure_ascii=False) + "\n"
+                for row, point_id, payload in zip(row_numbers, ids, payloads)
+            ))
+
+        self.ids.extend(new_ids)
+        self.payloads.extend([None] * len(new_ids))
+        for row, payload in zip(row_numbers, payloads):
+            self.payloads[row] = payload
+        self.rows = rows
+        self.count += len(new_ids)
+
+    def search(self, query_vector: List[float], limit: int):
+        if not self.count or limit <= 0:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        if self.normalize:
+            query = query / max(float(np.linalg.norm(query)), np.finfo(np.float32).tiny)
+
+        matrix, count = self.matrix, self.count
+        scores = matrix[:count] @ query
+        limit = min(limit, count)
+
+        # argpartition finds the top rows in linear time, only those are sorted
+        top_rows = np.argpartition(-scores, limit - 1)[:limit]
+        top_rows = top_rows[np.argsort(-scores[top_rows])]
+        return [(int(row), float(scores[row])) for row in top_rows]
+
+    def close(self):
+        if self.matrix is not None:
+            self.matrix.flush()
+            self.matrix = None
+
+
+class NumpyProvider(VectorDBInterface):
+    """
+    in process vector db, every collection is a memory mapped float32 matrix under `path`,
+    searched with one matrix-vector product, no network hop and no server to run
+    """
+    def __init__(self, path: str, distance_metric: str = "cosine"):
+        self.path = path
+        self.distance_metric = distance_metric
+
+        # opened collections and one write lock per collection
+        self.collections = {}
+        self.locks = {}
+
+    async def connect(self):
+        os.makedirs(self.path, exist_ok=True)
+        logger.info(f"Opened numpy vector database at '{self.path}'.")
+
+    async def disconnect(self):
+        for collection in self.collections.values():
+            collection.close()
+        self.collections = {}
+        logger.info("Closed numpy vector database.")
+
+    def collection_path(self, collection_name: str) -> str:
+        if os.sep in collection_name or collection_name in ("", ".", ".."):
+            raise ValueError(f"Invalid collection name '{collection_name}'")
+        return os.path.join(self.path, collection_name)
+
+    def get_lock(self, collection_name: str) -> asyncio.Lock:
+        return self.locks.setdefault(collection_name, asyncio.Lock())
+
+    async def get_collection(self, collection_name: str) -> MemmapCollection:
+        collection = self.collections.get(collection_name)
+        if collection is not None:
+            return collection
+
+        path = self.collection_path(collection_name)
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            raise CollectionNotFoundError(collection_name)
+
+        collection = await run_blocking(MemmapCollection.open, path)
+        return self.collections.setdefault(collection_name, collection)
+
+    async def is_collection_exist(self, collection_name):
+        return (collection_name in self.collections
+                or os.path.exists(os.path.join(self.collection_path(collection_name), "meta.json")))
+
+    async def list_all_collections(self):
+        return sorted(name for name in os.listdir(self.path)
+                      if os.path.exists(os.path.join(self.path, name, "meta.json")))
+
+    async def get_collection_info(self, collection_name):
+        try:
+            collection = await self.get_collection(collection_name)
+        except CollectionNotFoundError:
+            logger.warning(f"Collection '{collection_name}' does not exist.")
+            return None
+
+        return {
+            "collection_name": collection_name,
+            "points_count": collection.count,
+            "capacity": collection.capacity,
+            "embedding_size": collection.embedding_size,
+            "distance": self.distance_metric,
+        }
+
+    async def delete_collection(self, collection_name):
+        if not await self.is_collection_exist(collection_name):
+            logger.warning(f"Collection '{collection_name}' does not exist.")
+            return
+
+        async with self.get_lock(collection_name):
+            collection = self.collections.pop(collection_name, None)
+            if collection is not None:
+                collection.close()
+            await run_blocking(shutil.rmtree, self.collection_path(collection_name))
+        logger.info(f"Collection '{collection_name}' deleted.")
+
+    async def create_collection(self, collection_name: str, embedding_size: int, do_reset: bool = False):
+        if do_reset:
+            await self.delete_collection(collection_name)
+
+        async with self.get_lock(collection_name):
+            if await self.is_collection_exist(collection_name):
+                logger.warning(f"Collection '{collection_name}' already exists.")
+                return
+
+            self.collections[collection_name] = await run_blocking(
+                MemmapCollection.create,
+                self.collection_path(collection_name),
+                embedding_size,
+                self.distance_metric == "cosine",
+            )
+        logger.info(f"Collection '{collection_name}' created.")
+
+    async def insert_one(self, collection_name: str, text: str, vector: list, record_id: str = None):
+        await self.insert_many(collection_name=collection_name, texts=[text], vectors=[vector],
+                               record_ids=[record_id or str(uuid.uuid4())])
+
+    async def insert_many(
+            self,
+            collection_name: str,
+            texts: List[str],
+            vectors: np.ndarray,
+            mongodb_ids: List[str] = None,
+            metadatas: List[dict] = None,
+            batch_size: int = 50,
+            record_ids: List[str] = None):
+
+        collection = await self.get_collection(collection_name)
+
+        # same ids as the qdrant provider, re-indexing overwrites rows instead of appending
+        if record_ids is None:
+            if mongodb_ids:
+                record_ids = [str(uuid.uuid5(uuid.NAMESPACE_OID, mongodb_id)) for mongodb_id in mongodb_ids]
+            else:
+                record_ids = [str(uuid.uuid4()) for _ in range(len(texts))]
+
+        payloads = [
+            {
+                "text": texts[i],
+                "mongodb_id": mongodb_ids[i] if mongodb_ids else None,
+                **(metadatas[i] if metadatas else {}),
+            }
+            for i in range(len(texts))
+        ]
+
+        try:
+            async with self.get_lock(collection_name):
+                for i in range(0, len(texts), batch_size):
+                    await run_blocking(collection.upsert, record_ids[i:i + batch_size],
+                                       vectors[i:i + batch_size], payloads[i:i + batch_size])
+            logger.info(f"Insert chunks successfully into collection '{collection_name}'.")
+        except Exception as e:
+            logger.error(f"Error inserting into collection '{collection_name}': {e}")
+            raise
+
+    async def search(self, collection_name: str, query_vector: list, limit: int = 5,
+                     hnsw_ef: int = None, exact: bool = False):
+        # the scan is always exact, there is no graph to tune
+        collection = await self.get_collection(collection_name)
+
+        try:
+            hits = await run_blocking(collection.search, query_vector, limit)
+        except Exception as e:
+            logger.error(f"Error searching in collection '{collection_name}': {e}")
+            raise
+
+        if not hits:
+            logger.warning(f"No related results found in collection '{collection_name}'.")
+            return None
+
+        retrieved_result = []
+        for row, score in hits:
+            payload = collection.payloads[row]
+            retrieved_result.append(RetrievedDocument(
+                score=score,
+                text=payload["text"],
+                start_time=payload.get("start_time"),
+                end_time=payload.get("end_time"),
+                video_id=payload.get("video_id"),
+                chunk_id=payload.get("mongodb_id"),
+            ))
+
+        logger.info(f"Search completed in collection '{collection_name}'. Found {len(retrieved_result)} results.")
+        return retrieved_result
+
+    async def search_videos(self, query_vector: list, limit: int = 10, group_size: int = 3,
+                            video_ids: List[str] = None, authors: List[str] = None,
+                            published_after=None, published_before=None):
+        # every video is its own file here, searching all of them would be the fan-out the shared mode avoids
+        raise UnsupportedStorageModeError(operation="search_videos", storage_mode=VectorDBStorageMode.PER_VIDEO.value)
+
+    async def get_memory_report(self, limit: int = 100) -> dict:
+        collection_names = await self.list_all_collections()
+
+        collections = {}
+        for collection_name in collection_names[:limit]:
+            collection = await self.get_collection(collection_name)
+            float32_bytes = collection.count * collection.embedding_size * 4
+            collections[collection_name] = {
+                "points_count": collection.count,
+                "vectors": {
+                    "default": {
+                        "size": collection.embedding_size,
+                        "on_disk": True,
+                        "quantization": None,
+                        "float32_bytes": float32_bytes,
+                    }
+                },
+                # memory mapped, the page cache holds what searches touch, the whole matrix when hot
+                "ram_bytes": float32_bytes,
+                "disk_bytes": os.path.getsize(collection.vectors_path) + os.path.getsize(collection.payloads_path),
+            }
+
+        return {
+            "profile": "memmap",
+            "collections_count": len(collection_names),
+            "reported_count": len(collections),
+            "ram_bytes": sum(report["ram_bytes"] for report in collections.values()),
+            "disk_bytes": sum(report["disk_bytes"] for report in collections.values()),
+            "collections": collections,
+        }
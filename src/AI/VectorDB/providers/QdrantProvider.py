@@ -1,33 +1,171 @@
+import httpx
+import numpy as np
 from qdrant_client import AsyncQdrantClient
 from qdrant_client.http import models
+from qdrant_client.http.exceptions import UnexpectedResponse
 from ..VDBInterface import VectorDBInterface
-from models.db_schemas import RetrievedDocument
+from ..VDBExceptions import CollectionNotFoundError, UnsupportedStorageModeError
+from ..VDBEnums import VectorDBStorageMode, VectorDBCollectionProfile
+from models.db_schemas import RetrievedDocument, RetrievedVideo
+from datetime import datetime
 from typing import List
 import uuid
 from utils.logging import get_logger
 logger = get_logger(__name__)
 
 class QdrantProvider(VectorDBInterface):
+
+    # prefix of the collection names RAGController gives every video
+    PER_VIDEO_PREFIX = "collection_"
+
+    # named vectors of a collection in the coarse mode
+    COARSE_VECTOR = "coarse"
+    FULL_VECTOR = "full"
+
+    # profile -> (float32 vectors on disk, quantization)
+    COLLECTION_PROFILES = {
+        VectorDBCollectionProfile.DEFAULT.value: (False, None),
+        VectorDBCollectionProfile.SCALAR_INT8.value: (False, "scalar"),
+        VectorDBCollectionProfile.BINARY.value: (False, "binary"),
+        VectorDBCollectionProfile.ON_DISK_INT8.value: (True, "scalar"),
+        VectorDBCollectionProfile.ON_DISK_BINARY.value: (True, "binary"),
+    }
+
     def __init__(self, host: str = "localhost", port: int = 6333, 
-                 grpc_port: int = 6334, distance_metric: str="cosine"):
+                 grpc_port: int = 6334, distance_metric: str="cosine",
+                 prefer_grpc: bool = False, timeout: int = None, max_connections: int = None,
+                 storage_mode: str = VectorDBStorageMode.PER_VIDEO.value,
+                 shared_collection_name: str = "video_chunks", shard_number: int = 1,
+                 collection_profile: str = VectorDBCollectionProfile.DEFAULT.value,
+                 hnsw_m: int = None, hnsw_ef_construct: int = None, hnsw_ef: int = None,
+                 rescore_oversampling: float = 2.0, coarse_size: int = 0, coarse_oversampling: int = 4):
         self.host = host
         self.port = port
         self.grpc_port = grpc_port
+        self.prefer_grpc = prefer_grpc
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.storage_mode = storage_mode
+        self.shared_collection_name = shared_collection_name
+        self.shard_number = shard_number
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construct = hnsw_ef_construct
+        self.hnsw_ef = hnsw_ef
+        self.rescore_oversampling = rescore_oversampling
+        self.coarse_size = coarse_size
+        self.coarse_oversampling = coarse_oversampling
         self.distance_metric = None
         self.client = None
 
+        # collections known to exist -> their coarse vector size (0 for a single unnamed vector,
+        # None until their config was read), saves an existence probe before every call
+        self.collections = {}
+
         if distance_metric == "cosine":
             self.distance_metric = models.Distance.COSINE
         elif distance_metric == "dot":
             self.distance_metric = models.Distance.DOT
 
+        if collection_profile not in self.COLLECTION_PROFILES:
+            raise ValueError(f"Unknown collection profile '{collection_profile}', "
+                             f"expected one of {sorted(self.COLLECTION_PROFILES)}")
+        self.collection_profile = collection_profile
+        self.vectors_on_disk, self.quantization = self.COLLECTION_PROFILES[collection_profile]
+
     async def connect(self):
+        # vectors travel as protobuf over gRPC instead of JSON over HTTP when prefer_grpc is set
+        extra_args = {}
+        if self.max_connections:
+            # the async REST client keeps no connections alive unless it is given limits
+            extra_args["limits"] = httpx.Limits(max_connections=self.max_connections,
+                                                max_keepalive_connections=self.max_connections)
+
         self.client = AsyncQdrantClient(
                 host=self.host,
                 port=self.port,
-                prefer_grpc=False,  # Use HTTP instead of gRPC
+                grpc_port=self.grpc_port,
+                prefer_grpc=self.prefer_grpc,
+                timeout=self.timeout,
+                **extra_args,
         )
-        logger.info("Connected to Qdrant database.")
+        logger.info(f"Connected to Qdrant database over {'gRPC' if self.prefer_grpc else 'HTTP'}.")
+        await self.refresh_collections()
+
+    async def refresh_collections(self):
+        response = await self.client.get_collections()
+        self.collections = {collection.name: self.collections.get(collection.name)
+                            for collection in response.collections}
+
+    async def has_collection(self, collection_name: str) -> bool:
+        if collection_name not in self.collections:
+            # created by another worker since the registry was filled
+            if not await self.client.collection_exists(collection_name):
+                return False
+            self.collections[collection_name] = None
+
+        if self.collections[collection_name] is None:
+            try:
+                collection_info = await self.client.get_collection(collection_name=collection_name)
+            except Exception as e:
+                if self.forget_collection(collection_name, e):
+                    return False
+                raise
+            self.register_layout(collection_name, collection_info)
+        return True
+
+    def register_layout(self, collection_name: str, collection_info) -> int:
+        """
+        record the vector layout a collection was created with, it is what every insert and search
+        has to use, whatever VECTOR_DB_COARSE_SIZE says now
+        """
+        vectors = collection_info.config.params.vectors
+        coarse_size = 0
+        if isinstance(vectors, dict) and self.COARSE_VECTOR in vectors:
+            coarse_size = vectors[self.COARSE_VECTOR].size
+
+        if coarse_size != self.coarse_size:
+            logger.warning(f"Collection '{collection_name}' was created with a coarse vector size of {coarse_size}, "
+                           f"VECTOR_DB_COARSE_SIZE is {self.coarse_size}, it keeps its own layout until it "
+                           f"is re-created")
+        self.collections[collection_name] = coarse_size
+        return coarse_size
+
+    async def get_coarse_size(self, collection_name: str) -> int:
+        if not await self.has_collection(collection_name):
+            logger.error(f"Collection '{collection_name}' does not exist.")
+            raise CollectionNotFoundError(collection_name)
+        return self.collections[collection_name]
+
+    def forget_collection(self, collection_name: str, error: Exception) -> bool:
+        """
+        drop a collection deleted behind our back from the registry, true if `error` says it is gone
+        """
+        if isinstance(error, UnexpectedResponse):
+            not_found = error.status_code == 404
+        else:
+            # grpc errors carry their status in code()
+            code = getattr(error, "code", None)
+            not_found = callable(code) and getattr(code(), "name", None) == "NOT_FOUND"
+
+        if not_found:
+            self.collections.pop(collection_name, None)
+        return not_found
+
+    def resolve_collection(self, collection_name: str):
+        """
+        map a per video collection name (collection_{video_id}) to the collection that actually holds
+        its points and the video id to filter on, the video id is None when no filtering is needed
+        """
+        if (self.storage_mode == VectorDBStorageMode.SHARED.value
+                and collection_name.startswith(self.PER_VIDEO_PREFIX)):
+            return self.shared_collection_name, collection_name[len(self.PER_VIDEO_PREFIX):]
+        return collection_name, None
+
+    @staticmethod
+    def video_filter(video_id: str):
+        return models.Filter(must=[
+            models.FieldCondition(key="video_id", match=models.MatchValue(value=video_id))
+        ])
 
     async def disconnect(self):
         if self.client:
@@ -35,21 +173,57 @@ class QdrantProvider(VectorDBInterface):
             logger.info("Disconnected from Qdrant database.")
 
     async def is_collection_exist(self, collection_name):
-        return await self.client.collection_exists(collection_name)
+        collection_name, video_id = self.resolve_collection(collection_name)
+        if video_id is None:
+            return await self.has_collection(collection_name)
+
+        # a video "collection" exists in the shared layout as long as it has points
+        if not await self.has_collection(collection_name):
+            return False
+        result = await self.client.count(collection_name=collection_name,
+                                         count_filter=self.video_filter(video_id), exact=True)
+        return result.count > 0
 
     async def list_all_collections(self):
         return await self.client.get_collections()
 
     async def get_collection_info(self, collection_name):
-        if await self.client.collection_exists(collection_name):
-            return await self.client.get_collection(collection_name=collection_name)
-        else:
+        collection_name, video_id = self.resolve_collection(collection_name)
+        if not await self.has_collection(collection_name):
             logger.warning(f"Collection '{collection_name}' does not exist.")
             return None
 
+        try:
+            collection_info = await self.client.get_collection(collection_name=collection_name)
+            if video_id is None:
+                return collection_info
+
+            result = await self.client.count(collection_name=collection_name,
+                                             count_filter=self.video_filter(video_id), exact=True)
+            return {
+                "collection_name": collection_name,
+                "video_id": video_id,
+                "points_count": result.count,
+                "config": collection_info.config,
+            }
+        except Exception as e:
+            if self.forget_collection(collection_name, e):
+                logger.warning(f"Collection '{collection_name}' does not exist.")
+                return None
+            raise
+
     async def delete_collection(self, collection_name):
-        if await self.client.collection_exists(collection_name):
+        collection_name, video_id = self.resolve_collection(collection_name)
+        if video_id is not None:
+            if await self.has_collection(collection_name):
+                await self.client.delete(collection_name=collection_name,
+                                         points_selector=models.FilterSelector(filter=self.video_filter(video_id)))
+                logger.info(f"Points of video '{video_id}' deleted from collection '{collection_name}'.")
+            return
+
+        if await self.has_collection(collection_name):
             await self.client.delete_collection(collection_name=collection_name)
+            self.collections.pop(collection_name, None)
             logger.info(f"Collection '{collection_name}' deleted.")
         else:
             logger.warning(f"Collection '{collection_name}' does not exist.")
@@ -58,18 +232,179 @@ class QdrantProvider(VectorDBInterface):
         if do_reset:
             await self.delete_collection(collection_name)
 
-        if not await self.client.collection_exists(collection_name):
+        collection_name, video_id = self.resolve_collection(collection_name)
+        if await self.has_collection(collection_name):
+            if video_id is None:
+                logger.warning(f"Collection '{collection_name}' already exists.")
+            return
+
+        try:
             await self.client.create_collection(
                 collection_name=collection_name,
-                vectors_config=models.VectorParams(
-                    size=embedding_size,
-                    distance=self.distance_metric
-                )
+                vectors_config=self.vectors_config(embedding_size=embedding_size),
+                shard_number=self.shard_number if video_id is not None else None,
+                hnsw_config=self.hnsw_config(),
+                quantization_config=None if self.coarse_size else self.quantization_config(),
             )
+            if video_id is not None:
+                await self.create_payload_indexes(collection_name)
+            self.collections[collection_name] = self.coarse_size
             logger.info(f"Collection '{collection_name}' created.")
-        else:
+        except UnexpectedResponse as e:
+            # lost a race with another worker creating the same collection, its layout is read on first use
+            if e.status_code != 409:
+                raise
+            self.collections[collection_name] = None
             logger.warning(f"Collection '{collection_name}' already exists.")
 
+    def vectors_config(self, embedding_size: int):
+        if not self.coarse_size:
+            return models.VectorParams(
+                size=embedding_size,
+                distance=self.distance_metric,
+                on_disk=self.vectors_on_disk or None,
+            )
+
+        if self.coarse_size >= embedding_size:
+            raise ValueError(f"Coarse vector size {self.coarse_size} must be smaller than the embedding size "
+                             f"{embedding_size}")
+
+        # matryoshka embeddings: the graph is built on a short prefix of every vector, the full
+        # vectors have no graph and stay on disk, they are only read to rescore candidates
+        return {
+            self.COARSE_VECTOR: models.VectorParams(
+                size=self.coarse_size,
+                distance=self.distance_metric,
+                on_disk=self.vectors_on_disk or None,
+                quantization_config=self.quantization_config(),
+            ),
+            self.FULL_VECTOR: models.VectorParams(
+                size=embedding_size,
+                distance=self.distance_metric,
+                on_disk=True,
+                hnsw_config=models.HnswConfigDiff(m=0),
+            ),
+        }
+
+    @staticmethod
+    def to_list(vector):
+        # float32 arrays are only unboxed into python floats at the transport boundary
+        return vector.tolist() if isinstance(vector, np.ndarray) else vector
+
+    def point_vector(self, vector, coarse_size: int = 0):
+        """
+        the vector of a point in the layout of its collection, `vector` may be a named vector of
+        a coarse collection, its full vector is used
+        """
+        if isinstance(vector, dict):
+            vector = vector[self.FULL_VECTOR]
+        vector = self.to_list(vector)
+        if not coarse_size:
+            return vector
+        return {self.COARSE_VECTOR: vector[:coarse_size], self.FULL_VECTOR: vector}
+
+    def rescore(self, query_vector: list, points: list) -> list:
+        """
+        replace the coarse scores of `points` (fetched with their full vector) by full vector scores
+        """
+        if not points:
+            return points
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        full_vectors = np.asarray([point.vector[self.FULL_VECTOR] for point in points], dtype=np.float32)
+        if self.distance_metric == models.Distance.COSINE:
+            query = query / max(float(np.linalg.norm(query)), np.finfo(np.float32).tiny)
+            full_vectors = full_vectors / np.maximum(np.linalg.norm(full_vectors, axis=1, keepdims=True),
+                                                     np.finfo(np.float32).tiny)
+
+        for point, score in zip(points, full_vectors @ query):
+            point.score = float(score)
+            point.vector = None
+        return sorted(points, key=lambda point: point.score, reverse=True)
+
+    def hnsw_config(self):
+        if self.hnsw_m is None and self.hnsw_ef_construct is None:
+            return None
+        return models.HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct)
+
+    def quantization_config(self):
+        # quantized copies always stay in RAM, they are what the graph search reads
+        if self.quantization == "scalar":
+            return models.ScalarQuantization(scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8, quantile=0.99, always_ram=True))
+        if self.quantization == "binary":
+            return models.BinaryQuantization(binary=models.BinaryQuantizationConfig(always_ram=True))
+        return None
+
+    def search_params(self, hnsw_ef: int = None, exact: bool = False):
+        """
+        per query search parameters, quantized candidates are oversampled and rescored
+        with the float32 vectors so the quantization costs little recall
+        """
+        hnsw_ef = hnsw_ef or self.hnsw_ef
+        quantization = None
+        if self.quantization is not None:
+            quantization = models.QuantizationSearchParams(rescore=True, oversampling=self.rescore_oversampling)
+
+        if not hnsw_ef and not exact and quantization is None:
+            return None
+        return models.SearchParams(hnsw_ef=hnsw_ef, exact=exact, quantization=quantization)
+
+    async def create_payload_indexes(self, collection_name: str):
+        # filtered search in the shared collection walks these indexes instead of scanning payloads
+        for field_name, field_schema in [("video_id", models.PayloadSchemaType.KEYWORD),
+                                         ("author", models.PayloadSchemaType.KEYWORD),
+                                         ("publish_time", models.PayloadSchemaType.DATETIME)]:
+            await self.client.create_payload_index(collection_name=collection_name,
+                                                   field_name=field_name, field_schema=field_schema)
+
+    async def migrate_collection(self, collection_name: str, extra_payload: dict = None,
+                                 batch_size: int = 256, delete_source: bool = False) -> int:
+        """
+        copy the points of a per video collection into the shared collection, tagged with the video id
+        and `extra_payload`, ids are kept so running it twice does not duplicate points
+        """
+        target_name, video_id = self.resolve_collection(collection_name)
+        if video_id is None:
+            raise ValueError(f"Collection '{collection_name}' has no shared collection to migrate to.")
+
+        if not await self.client.collection_exists(collection_name):
+            raise CollectionNotFoundError(collection_name)
+
+        source_info = await self.client.get_collection(collection_name=collection_name)
+        source_vectors = source_info.config.params.vectors
+        if isinstance(source_vectors, dict):
+            source_vectors = source_vectors[self.FULL_VECTOR]
+        await self.create_collection(collection_name=collection_name, embedding_size=source_vectors.size)
+        coarse_size = await self.get_coarse_size(target_name)
+
+        migrated_count = 0
+        offset = None
+        while True:
+            records, offset = await self.client.scroll(collection_name=collection_name, limit=batch_size,
+                                                       offset=offset, with_payload=True, with_vectors=True)
+            if records:
+                await self.client.upsert(
+                    collection_name=target_name,
+                    points=[
+                        models.PointStruct(
+                            id=record.id,
+                            vector=self.point_vector(record.vector, coarse_size=coarse_size),
+                            payload={**record.payload, **(extra_payload or {}), "video_id": video_id},
+                        )
+                        for record in records
+                    ]
+                )
+                migrated_count += len(records)
+            if offset is None:
+                break
+
+        logger.info(f"Migrated {migrated_count} points from '{collection_name}' into '{target_name}'.")
+        if delete_source:
+            await self.client.delete_collection(collection_name=collection_name)
+            self.collections.pop(collection_name, None)
+        return migrated_count
+
     async def insert_one(
             self,
             collection_name:str,
@@ -78,9 +413,8 @@ class QdrantProvider(VectorDBInterface):
             record_id:str = None
         ):
 
-        if not await self.client.collection_exists(collection_name):
-            logger.error(f"Collection '{collection_name}' does not exist.")
-            raise
+        collection_name, video_id = self.resolve_collection(collection_name)
+        coarse_size = await self.get_coarse_size(collection_name)
 
         record_id = record_id or str(uuid.uuid4())
         try:
@@ -89,40 +423,52 @@ class QdrantProvider(VectorDBInterface):
                 points=[
                     models.PointStruct(
                     id= record_id,
-                    vector= vector, 
-                    payload= {"text": text}
+                    vector= self.point_vector(vector, coarse_size=coarse_size), 
+                    payload= {"text": text, **({"video_id": video_id} if video_id else {})}
             )])
             logger.info(f"Inserted one document into collection '{collection_name}'.")
 
         except Exception as e:
             logger.error(f"Error inserting document into collection '{collection_name}': {e}")
+            if self.forget_collection(collection_name, e):
+                raise CollectionNotFoundError(collection_name) from e
             raise
 
     async def insert_many(
             self,
             collection_name:str,
             texts:List[str],
-            vectors:List[List[float]],
+            vectors:np.ndarray,
             mongodb_ids:List[str] = None,
+            metadatas:List[dict] = None,
             batch_size:int = 50):
 
-        if not await self.client.collection_exists(collection_name):
-            logger.error(f"Collection '{collection_name}' does not exist.")
-            raise
+        collection_name, video_id = self.resolve_collection(collection_name)
+        coarse_size = await self.get_coarse_size(collection_name)
 
-        record_ids = [str(uuid.uuid4()) for _ in range(len(texts))]
+        # ids derived from the mongodb chunk ids keep re-indexing idempotent
+        if mongodb_ids:
+            record_ids = [str(uuid.uuid5(uuid.NAMESPACE_OID, mongodb_id)) for mongodb_id in mongodb_ids]
+        else:
+            record_ids = [str(uuid.uuid4()) for _ in range(len(texts))]
+        # a (texts, embedding size) float32 matrix, every upsert batch is a view of it
+        vectors = np.asarray(vectors, dtype=np.float32)
         try:
             for i in range(0, len(texts), batch_size):
                 batch_points = []
+                batch_vectors = vectors[i:i + batch_size]
                 for j in range(i, min(i + batch_size, len(texts))):
                     payload = {
                         "text": texts[j],
-                        "mongodb_id": mongodb_ids[j] if mongodb_ids else None
+                        "mongodb_id": mongodb_ids[j] if mongodb_ids else None,
+                        **(metadatas[j] if metadatas else {}),
                     }
+                    if video_id:
+                        payload["video_id"] = video_id
 
                     point = models.PointStruct(
                         id=record_ids[j],
-                        vector=vectors[j],
+                        vector=self.point_vector(batch_vectors[j - i], coarse_size=coarse_size),
                         payload=payload
                     )
                     batch_points.append(point)
@@ -137,15 +483,30 @@ class QdrantProvider(VectorDBInterface):
             logger.info(f"Insert chunks successfully into collection '{collection_name}'.")
         except Exception as e:
             logger.error(f"Error inserting into collection '{collection_name}': {e}")
+            if self.forget_collection(collection_name, e):
+                raise CollectionNotFoundError(collection_name) from e
             raise
 
-    async def search(self, collection_name:str, query_vector:list, limit:int = 5):
+    async def search(self, collection_name:str, query_vector:list, limit:int = 5,
+                     hnsw_ef:int = None, exact:bool = False):
+        collection_name, video_id = self.resolve_collection(collection_name)
+        query_filter = self.video_filter(video_id) if video_id else None
+        query_vector = self.to_list(query_vector)
+        coarse_size = await self.get_coarse_size(collection_name)
         try:
-            search_result = await self.client.search(
-                collection_name=collection_name,
-                query_vector=query_vector,
-                limit=limit
-            )
+            if coarse_size and not exact:
+                search_result = await self.coarse_search(collection_name=collection_name,
+                                                         query_vector=query_vector, query_filter=query_filter,
+                                                         limit=limit, hnsw_ef=hnsw_ef, coarse_size=coarse_size)
+            else:
+                search_result = await self.client.search(
+                    collection_name=collection_name,
+                    query_vector=(models.NamedVector(name=self.FULL_VECTOR, vector=query_vector)
+                                  if coarse_size else query_vector),
+                    query_filter=query_filter,
+                    search_params=self.search_params(hnsw_ef=hnsw_ef, exact=exact),
+                    limit=limit
+                )
 
             if not search_result or len(search_result) == 0:
                 logger.warning(f"No related results found in collection '{collection_name}'.")
@@ -155,6 +516,10 @@ class QdrantProvider(VectorDBInterface):
                 RetrievedDocument(**{
                             "score": result.score,
                             "text": result.payload["text"],
+                            "start_time": result.payload.get("start_time"),
+                            "end_time": result.payload.get("end_time"),
+                            "video_id": result.payload.get("video_id"),
+                            "chunk_id": result.payload.get("mongodb_id"),
                         }
                     )
                 for result in search_result
@@ -165,4 +530,159 @@ class QdrantProvider(VectorDBInterface):
 
         except Exception as e:
             logger.error(f"Error searching in collection '{collection_name}': {e}")
-            raise
\ No newline at end of file
+            if self.forget_collection(collection_name, e):
+                raise CollectionNotFoundError(collection_name) from e
+            raise
+
+    async def coarse_search(self, collection_name: str, query_vector: list, coarse_size: int,
+                            query_filter=None, limit: int = 5, hnsw_ef: int = None):
+        """
+        search the prefix vectors for limit * coarse_oversampling candidates, then rank them by their
+        full vectors, only the candidates' full vectors are ever read
+        """
+        candidates = await self.client.search(
+            collection_name=collection_name,
+            query_vector=models.NamedVector(name=self.COARSE_VECTOR, vector=query_vector[:coarse_size]),
+            query_filter=query_filter,
+            search_params=self.search_params(hnsw_ef=hnsw_ef),
+            limit=limit * self.coarse_oversampling,
+            with_vectors=[self.FULL_VECTOR],
+        )
+        return self.rescore(query_vector=query_vector, points=candidates)[:limit]
+
+    @staticmethod
+    def videos_filter(video_ids: List[str] = None, authors: List[str] = None,
+                      published_after: datetime = None, published_before: datetime = None):
+        conditions = []
+        if video_ids:
+            conditions.append(models.FieldCondition(key="video_id", match=models.MatchAny(any=video_ids)))
+        if authors:
+            conditions.append(models.FieldCondition(key="author", match=models.MatchAny(any=authors)))
+        if published_after or published_before:
+            conditions.append(models.FieldCondition(
+                key="publish_time",
+                range=models.DatetimeRange(gte=published_after, lte=published_before)
+            ))
+        return models.Filter(must=conditions) if conditions else None
+
+    async def search_videos(self, query_vector: list, limit: int = 10, group_size: int = 3,
+                            video_ids: List[str] = None, authors: List[str] = None,
+                            published_after: datetime = None, published_before: datetime = None):
+        """
+        search every video at once, the best `group_size` chunks of the top `limit` videos,
+        the filters run on the payload indexes of the shared collection so there is no fan-out
+        """
+        if self.storage_mode != VectorDBStorageMode.SHARED.value:
+            raise UnsupportedStorageModeError(operation="search_videos", storage_mode=self.storage_mode)
+
+        collection_name = self.shared_collection_name
+        coarse_size = await self.get_coarse_size(collection_name)
+        query_vector = self.to_list(query_vector)
+
+        try:
+            groups_result = await self.client.search_groups(
+                collection_name=collection_name,
+                query_vector=(models.NamedVector(name=self.COARSE_VECTOR, vector=query_vector[:coarse_size])
+                              if coarse_size else query_vector),
+                group_by="video_id",
+                query_filter=self.videos_filter(video_ids=video_ids, authors=authors,
+                                                published_after=published_after,
+                                                published_before=published_before),
+                search_params=self.search_params(),
+                limit=limit,
+                group_size=group_size * self.coarse_oversampling if coarse_size else group_size,
+                with_payload=["text", "start_time", "end_time", "video_id", "mongodb_id"],
+                with_vectors=[self.FULL_VECTOR] if coarse_size else False,
+            )
+        except Exception as e:
+            logger.error(f"Error searching videos in collection '{collection_name}': {e}")
+            if self.forget_collection(collection_name, e):
+                raise CollectionNotFoundError(collection_name) from e
+            raise
+
+        # groups come ordered by their best hit, hits by score
+        groups = [(group.id, group.hits) for group in groups_result.groups if group.hits]
+        if coarse_size:
+            groups = [(group_id, self.rescore(query_vector=query_vector, points=hits)[:group_size])
+                      for group_id, hits in groups]
+            groups.sort(key=lambda group: group[1][0].score, reverse=True)
+
+        retrieved_videos = [
+            RetrievedVideo(
+                video_id=str(group_id),
+                score=hits[0].score,
+                documents=[
+                    RetrievedDocument(
+                        score=hit.score,
+                        text=hit.payload["text"],
+                        start_time=hit.payload.get("start_time"),
+                        end_time=hit.payload.get("end_time"),
+                        video_id=hit.payload.get("video_id"),
+                        chunk_id=hit.payload.get("mongodb_id"),
+                    )
+                    for hit in hits
+                ],
+            )
+            for group_id, hits in groups
+        ]
+        logger.info(f"Video search completed in collection '{collection_name}'. Found {len(retrieved_videos)} videos.")
+        return retrieved_videos
+
+    @staticmethod
+    def estimate_memory(collection_info) -> dict:
+        """
+        rough RAM and disk footprint of a collection from its config: float32 vectors,
+        quantized copies and the HNSW links (2 * m neighbour ids per point on the base layer)
+        """
+        config = collection_info.config
+        points_count = collection_info.points_count or 0
+        vectors = config.params.vectors
+        named_vectors = vectors if isinstance(vectors, dict) else {"": vectors}
+
+        report = {"points_count": points_count, "vectors": {}, "ram_bytes": 0, "disk_bytes": 0}
+        for name, params in named_vectors.items():
+            quantization = params.quantization_config or config.quantization_config
+            hnsw_m = (params.hnsw_config.m if params.hnsw_config and params.hnsw_config.m is not None
+                      else config.hnsw_config.m)
+
+            float32_bytes = points_count * params.size * 4
+            quantized_bytes = 0
+            quantization_name = None
+            if isinstance(quantization, models.ScalarQuantization):
+                quantization_name, quantized_bytes = "scalar_int8", points_count * params.size
+            elif isinstance(quantization, models.BinaryQuantization):
+                quantization_name, quantized_bytes = "binary", points_count * ((params.size + 7) // 8)
+            elif quantization is not None:
+                quantization_name = type(quantization).__name__
+            hnsw_bytes = points_count * hnsw_m * 2 * 4
+
+            report["vectors"][name or "default"] = {
+                "size": params.size,
+                "on_disk": bool(params.on_disk),
+                "quantization": quantization_name,
+                "hnsw_m": hnsw_m,
+                "float32_bytes": float32_bytes,
+                "quantized_bytes": quantized_bytes,
+                "hnsw_bytes": hnsw_bytes,
+            }
+            report["ram_bytes"] += (0 if params.on_disk else float32_bytes) + quantized_bytes + hnsw_bytes
+            report["disk_bytes"] += float32_bytes if params.on_disk else 0
+        return report
+
+    async def get_memory_report(self, limit: int = 100) -> dict:
+        await self.refresh_collections()
+        collection_names = sorted(self.collections)
+
+        collections = {}
+        for collection_name in collection_names[:limit]:
+            collection_info = await self.client.get_collection(collection_name=collection_name)
+            collections[collection_name] = self.estimate_memory(collection_info)
+
+        return {
+            "profile": self.collection_profile,
+            "collections_count": len(collection_names),
+            "reported_count": len(collections),
+            "ram_bytes": sum(report["ram_bytes"] for report in collections.values()),
+            "disk_bytes": sum(report["disk_bytes"] for report in collections.values()),
+            "collections": collections,
+        }
@@ -1 +1,19 @@
-from .QdrantProvider import QdrantProvider
\ No newline at end of file
+import importlib
+from utils.startup_timing import startup_timer
+
+# each provider module pulls in its client library, so it is only imported once the factory asks for it
+PROVIDER_MODULES = {
+    "QdrantProvider": ".QdrantProvider",
+    "NumpyProvider": ".NumpyProvider",
+}
+
+def __getattr__(name):
+    if name not in PROVIDER_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    with startup_timer.measure("import", f"{__name__}{PROVIDER_MODULES[name]}"):
+        module = importlib.import_module(PROVIDER_MODULES[name], __name__)
+
+    provider = getattr(module, name)
+    globals()[name] = provider
+    return provider
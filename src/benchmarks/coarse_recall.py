@@ -0,0 +1,115 @@
+"""
+offline recall and latency of the coarse vector mode (VECTOR_DB_COARSE_SIZE) against exact full
+dimension search, for a stored query set of json lines {"video_id": "...", "query": "..."},
+run from src/ with the app settings of an indexed deployment:
+
+    python -m benchmarks.coarse_recall --queries queries.jsonl --limit 5
+
+for every query it compares the top `limit` chunks of
+  exact     brute force search on the full vectors (the ground truth)
+  coarse    graph search on the prefix vectors only
+  rescored  graph search on the prefix vectors, candidates rescored with the full vectors (what /search does)
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from qdrant_client.http import models
+from AI.LLM.LLMFactory import LLMProviderFactory
+from AI.LLM.LLMEnums import DocumentTypeEnum
+from AI.VectorDB.VDBFactory import VDBFactory
+from utils.app_config import get_settings
+
+
+def load_queries(path: str, max_queries: int = None):
+    with open(path) as queries_file:
+        queries = [json.loads(line) for line in queries_file if line.strip()]
+    return queries[:max_queries] if max_queries else queries
+
+
+async def timed(call):
+    started_at = time.perf_counter()
+    result = await call
+    return result, time.perf_counter() - started_at
+
+
+async def coarse_only_search(provider, collection_name: str, query_vector: list, limit: int):
+    collection_name, video_id = provider.resolve_collection(collection_name)
+    coarse_size = await provider.get_coarse_size(collection_name)
+    points = await provider.client.search(
+        collection_name=collection_name,
+        query_vector=models.NamedVector(name=provider.COARSE_VECTOR,
+                                        vector=provider.to_list(query_vector[:coarse_size])),
+        query_filter=provider.video_filter(video_id) if video_id else None,
+        search_params=provider.search_params(),
+        limit=limit,
+    )
+    return [point.payload.get("mongodb_id") for point in points]
+
+
+def recall(found: list, expected: list) -> float:
+    if not expected:
+        return 1.0
+    return len(set(found) & set(expected)) / len(expected)
+
+
+def summarize(name: str, recalls: list, latencies: list) -> str:
+    latencies = sorted(latencies)
+    p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+    return (f"{name:<10}{statistics.mean(recalls):>10.3f}{statistics.median(latencies) * 1000:>12.2f}"
+            f"{p95 * 1000:>12.2f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", required=True, help="json lines file of {video_id, query}")
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--max-queries", type=int, default=None)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    embedding_client = LLMProviderFactory(settings).create(provider=settings.EMBEDDING_BACKEND)
+    embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID, embedding_size=settings.EMBEDDING_SIZE)
+
+    provider = VDBFactory(settings).create(provider=settings.VECTOR_DB_BACKEND)
+    if not getattr(provider, "coarse_size", 0):
+        raise SystemExit("set VECTOR_DB_COARSE_SIZE (and re-index) to compare the coarse vector mode")
+    await provider.connect()
+
+    queries = load_queries(args.queries, max_queries=args.max_queries)
+    query_vectors = await embedding_client.embed_many(texts=[item["query"] for item in queries],
+                                                      document_type=DocumentTypeEnum.QUERY.value)
+
+    results = {"exact": ([], []), "coarse": ([], []), "rescored": ([], [])}
+    try:
+        for item, query_vector in zip(queries, query_vectors):
+            collection_name = f"{provider.PER_VIDEO_PREFIX}{item['video_id']}"
+
+            exact, exact_seconds = await timed(provider.search(collection_name=collection_name,
+                                                               query_vector=query_vector,
+                                                               limit=args.limit, exact=True))
+            expected = [doc.chunk_id for doc in exact or []]
+
+            coarse, coarse_seconds = await timed(coarse_only_search(provider, collection_name=collection_name,
+                                                                    query_vector=query_vector, limit=args.limit))
+            rescored, rescored_seconds = await timed(provider.search(collection_name=collection_name,
+                                                                     query_vector=query_vector, limit=args.limit))
+
+            for name, found, seconds in [("exact", expected, exact_seconds),
+                                         ("coarse", coarse, coarse_seconds),
+                                         ("rescored", [doc.chunk_id for doc in rescored or []], rescored_seconds)]:
+                results[name][0].append(recall(found, expected))
+                results[name][1].append(seconds)
+    finally:
+        await provider.disconnect()
+
+    print(f"{len(queries)} queries, top {args.limit}, coarse {provider.coarse_size} dims of "
+          f"{settings.EMBEDDING_SIZE}, oversampling x{provider.coarse_oversampling}")
+    print(f"{'search':<10}{'recall':>10}{'p50 ms':>12}{'p95 ms':>12}")
+    for name, (recalls, latencies) in results.items():
+        print(summarize(name, recalls, latencies))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""
+peak resident memory of indexing one video: the chunks go through the real embedding stack
+(openai provider -> scheduler -> cache) and RAGController.index_into_vdb_collection into the qdrant
+provider, the embeddings API answers with random vectors and the qdrant transport drops the
+points, so only what the process itself holds is measured, run from src/ with the app settings:
+
+    python -m benchmarks.indexing_memory --chunks 5000 --embedding-size 1024
+
+to compare with an older revision, check it out next to this one and pass its src/ directory:
+
+    git worktree add /tmp/before <revision>
+    python -m benchmarks.indexing_memory --before /tmp/before/src
+
+every tree is measured in a python process of its own, ru_maxrss only ever grows
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+RESULT_PREFIX = "RESULT "
+SRC_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def peak_rss_bytes() -> int:
+    # kilobytes on linux, bytes on macos
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class FakeEmbeddings:
+    """
+    stands in for AsyncOpenAI().embeddings, vectors arrive as lists of python floats like the sdk's
+    """
+    def __init__(self):
+        self.rng = random.Random(0)
+
+    async def create(self, input, model, dimensions):
+        data = [SimpleNamespace(index=i, embedding=[self.rng.uniform(-1, 1) for _ in range(dimensions)])
+                for i in range(len(input))]
+        return SimpleNamespace(data=data)
+
+
+class NullTransport:
+    async def upsert(self, collection_name, points, **kwargs):
+        return None
+
+
+async def index_video(chunks_count: int, embedding_size: int, chunk_characters: int) -> dict:
+    from bson import ObjectId
+    from AI.LLM.EmbeddingCache import EmbeddingCache
+    from AI.LLM.EmbeddingScheduler import EmbeddingScheduler
+    from AI.LLM.providers.OpenAIProvider import OpenAIProvider
+    from AI.VectorDB.providers.QdrantProvider import QdrantProvider
+    from controllers import RAGController
+    from models.db_schemas import Chunk
+
+    provider = OpenAIProvider(api_key="benchmark")
+    provider.client = SimpleNamespace(embeddings=FakeEmbeddings())
+    provider.set_embedding_model(model_id="benchmark", embedding_size=embedding_size)
+    embedding_client = EmbeddingCache(client=EmbeddingScheduler(client=provider), provider="openai")
+
+    vectordb_client = QdrantProvider()
+    vectordb_client.client = NullTransport()
+
+    rag_controller = RAGController(vectordb_client=vectordb_client, generation_client=None,
+                                   embedding_client=embedding_client, template_parser=None)
+    collection_name = rag_controller.create_collection_name(video_id="benchmark00")
+    if isinstance(vectordb_client.collections, dict):
+        vectordb_client.collections[collection_name] = 0
+    else:
+        # older revisions keep the known collection names in a set
+        vectordb_client.collections.add(collection_name)
+
+    video_id = ObjectId()
+    chunks = [Chunk(_id=ObjectId(), chunk_video_id=video_id, chunk_index=i,
+                    chunk_text=f"chunk {i} " + "x" * chunk_characters, start_time=float(i), end_time=float(i + 1))
+              for i in range(chunks_count)]
+
+    baseline = peak_rss_bytes()
+    started_at = time.perf_counter()
+    await rag_controller.index_into_vdb_collection(chunks=chunks, collection_name=collection_name)
+    seconds = time.perf_counter() - started_at
+    peak = peak_rss_bytes()
+
+    return {"baseline_bytes": baseline, "peak_bytes": peak, "seconds": seconds}
+
+
+def measure(src_path: str, args) -> dict:
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", "--src", src_path,
+         "--chunks", str(args.chunks), "--embedding-size", str(args.embedding_size),
+         "--chunk-characters", str(args.chunk_characters)],
+        cwd=src_path, capture_output=True, text=True,
+    )
+    for line in completed.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    raise SystemExit(f"indexing failed in '{src_path}':\n{completed.stderr[-2000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--embedding-size", type=int, default=1024)
+    parser.add_argument("--chunk-characters", type=int, default=500)
+    parser.add_argument("--before", default=None, help="src/ directory of the revision to compare with")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--src", default=SRC_PATH, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, args.src)
+        result = asyncio.run(index_video(chunks_count=args.chunks, embedding_size=args.embedding_size,
+                                         chunk_characters=args.chunk_characters))
+        print(RESULT_PREFIX + json.dumps(result))
+        return
+
+    trees = [("before", os.path.abspath(args.before))] if args.before else []
+    trees.append(("current", SRC_PATH))
+
+    print(f"indexing {args.chunks} chunks of {args.embedding_size} dimensions")
+    print(f"{'tree':<10}{'peak MB':>10}{'indexing MB':>14}{'seconds':>10}")
+    for name, src_path in trees:
+        result = measure(src_path, args)
+        print(f"{name:<10}{result['peak_bytes'] / 2**20:>10.1f}"
+              f"{(result['peak_bytes'] - result['baseline_bytes']) / 2**20:>14.1f}{result['seconds']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+compare upsert throughput and search latency of the HTTP and gRPC transports of QdrantProvider
+against a running qdrant, run from src/:
+
+    python -m benchmarks.qdrant_transport --host localhost --points 5000 --dim 1024
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from AI.VectorDB.providers import QdrantProvider
+
+
+def random_vectors(count: int, dim: int, seed: int):
+    rng = random.Random(seed)
+    return [[rng.uniform(-1, 1) for _ in range(dim)] for _ in range(count)]
+
+
+async def run_transport(args, prefer_grpc: bool, vectors, queries) -> dict:
+    provider = QdrantProvider(host=args.host, port=args.port, grpc_port=args.grpc_port,
+                              prefer_grpc=prefer_grpc, timeout=args.timeout,
+                              max_connections=args.concurrency)
+    await provider.connect()
+
+    collection_name = f"benchmark_{'grpc' if prefer_grpc else 'http'}"
+    try:
+        await provider.create_collection(collection_name=collection_name, embedding_size=args.dim, do_reset=True)
+        texts = [f"benchmark point {i}" for i in range(len(vectors))]
+
+        started_at = time.perf_counter()
+        await provider.insert_many(collection_name=collection_name, texts=texts, vectors=vectors,
+                                   batch_size=args.batch_size)
+        upsert_seconds = time.perf_counter() - started_at
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies = []
+
+        async def timed_search(query_vector):
+            async with semaphore:
+                query_started_at = time.perf_counter()
+                await provider.search(collection_name=collection_name, query_vector=query_vector, limit=args.limit)
+                latencies.append(time.perf_counter() - query_started_at)
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*[timed_search(query) for query in queries])
+        search_seconds = time.perf_counter() - started_at
+
+        latencies.sort()
+        return {
+            "transport": "grpc" if prefer_grpc else "http",
+            "upsert_points_per_second": len(vectors) / upsert_seconds,
+            "search_p50_ms": statistics.median(latencies) * 1000,
+            "search_p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+            "search_queries_per_second": len(queries) / search_seconds,
+        }
+    finally:
+        await provider.delete_collection(collection_name=collection_name)
+        await provider.disconnect()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6333)
+    parser.add_argument("--grpc-port", type=int, default=6334)
+    parser.add_argument("--timeout", type=int, default=60)
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    vectors = random_vectors(count=args.points, dim=args.dim, seed=1)
+    queries = random_vectors(count=args.queries, dim=args.dim, seed=2)
+
+    results = [await run_transport(args, prefer_grpc=prefer_grpc, vectors=vectors, queries=queries)
+               for prefer_grpc in (False, True)]
+
+    print(f"{args.points} points of {args.dim} dims, {args.queries} searches at concurrency {args.concurrency}")
+    print(f"{'transport':<10}{'upsert pts/s':>14}{'search p50 ms':>15}{'search p95 ms':>15}{'search q/s':>12}")
+    for result in results:
+        print(f"{result['transport']:<10}{result['upsert_points_per_second']:>14.0f}"
+              f"{result['search_p50_ms']:>15.2f}{result['search_p95_ms']:>15.2f}"
+              f"{result['search_queries_per_second']:>12.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,4 +1,6 @@
 from .data_controller import DataController
 from .process_controller import TextProcessor
 from .rag_controller import RAGController
-from .base_controller import BaseController
\ No newline at end of file
+from .base_controller import BaseController
+from .ingestion_controller import IngestionController
+from .job_controller import JobController
\ No newline at end of file
@@ -1,74 +1,136 @@
 from typing import Tuple, Dict, List, Optional
 from .base_controller import BaseController
-import requests
-from youtube_transcript_api import YouTubeTranscriptApi
+import asyncio
+import httpx
+from html import unescape
+from youtube_transcript_api._settings import WATCH_URL, INNERTUBE_API_URL, INNERTUBE_CONTEXT
+from youtube_transcript_api._transcripts import TranscriptList, TranscriptListFetcher, _TranscriptParser
 from youtube_transcript_api._errors import (
     NoTranscriptFound, 
     TranscriptsDisabled, 
     VideoUnavailable,
+    FailedToCreateConsentCookie,
+    PoTokenRequired,
+    YouTubeRequestFailed,
 )
 import re
 
 from utils import logging
 logger = logging.get_logger(__name__)
 class DataController(BaseController):
-    def __init__(self, video_url: str):
+    # the YouTube Data API accepts up to 50 ids (or results) per call
+    YOUTUBE_API_MAX_RESULTS = 50
+    VIDEO_URL_PATTERN = r'^(?:https?:\/\/)?(?:www\.)?(?:youtube\.com\/watch\?v=|youtu\.be\/)([\w\-_]{11})(?:\S+)?$'
+
+    def __init__(self, http_client: httpx.AsyncClient, video_url: str = None):
         super().__init__()
         self.video_url = video_url
+        self.http_client = http_client
+
+    @classmethod
+    def parse_video_id(cls, video_url: str) -> Optional[str]:
+        match = re.match(cls.VIDEO_URL_PATTERN, video_url or "")
+        return match.group(1) if match else None
 
     async def get_video_id(self) -> str:
     
-        pattern = r'^(?:https?:\/\/)?(?:www\.)?(?:youtube\.com\/watch\?v=|youtu\.be\/)([\w\-_]{11})(?:\S+)?$'
-        match = re.match(pattern, self.video_url)
-        if match:
-            logger.info(f"Extracted video ID: {match.group(1)}")
-            return match.group(1)
+        video_id = self.parse_video_id(self.video_url)
+        if video_id:
+            logger.info(f"Extracted video ID: {video_id}")
+            return video_id
         else:
             logger.error("Failed to extract video ID from URL")
             raise
 
     async def get_video_metadata(self, video_id: str) -> Dict:
 
+        videos_metadata = await self.get_videos_metadata(video_ids=[video_id])
+        if video_id not in videos_metadata:
+            logger.error(f"Video not found for ID: {video_id}")
+            return None
+        return videos_metadata[video_id]
+
+    async def get_videos_metadata(self, video_ids: List[str]) -> Dict[str, Dict]:
+        """
+        fetch the snippets of many videos, 50 ids per YouTube Data API call, missing videos are left out
+        """
         try:
             url = "https://www.googleapis.com/youtube/v3/videos"
             api_key = self.app_settings.YOUTUBE_API
 
-            params = {
-                "part": "snippet",
-                "id": video_id,
-                "key": api_key
-            }
+            videos_metadata = {}
+            for i in range(0, len(video_ids), self.YOUTUBE_API_MAX_RESULTS):
+                params = {
+                    "part": "snippet",
+                    "id": ",".join(video_ids[i: i + self.YOUTUBE_API_MAX_RESULTS]),
+                    "key": api_key
+                }
 
-            response = requests.get(url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                if data['items']:
-                    snippet = data['items'][0]['snippet']
+                response = await self.http_client.get(url, params=params)
+                if response.status_code != 200:
+                    logger.error(f"API request failed with status {response.status_code}")
+                    continue
 
-                    return {
+                for item in response.json().get('items', []):
+                    snippet = item['snippet']
+                    videos_metadata[item['id']] = {
                         "title": snippet.get("title", "Unavailable"),
                         "author": snippet.get("channelTitle", "Unavailable"),
                         "description": snippet.get("description", ""),
                         "publish_time": snippet.get("publishedAt", ""),
                     }
-                else:
-                    logger.error(f"Video not found for ID: {video_id}")
-                    return None
-            else:
-                logger.error(f"API request failed with status {response.status_code}")
-                return None
+
+            return videos_metadata
         
         except Exception as e:
             logger.error(f"Error fetching video metadata: {str(e)}")
             raise
 
-    def get_video_transcript(self, video_id: str) -> Optional[List[dict]]:
+    async def get_playlist_video_ids(self, playlist_id: str) -> List[str]:
+
+        try:
+            url = "https://www.googleapis.com/youtube/v3/playlistItems"
+            params = {
+                "part": "contentDetails",
+                "playlistId": playlist_id,
+                "maxResults": self.YOUTUBE_API_MAX_RESULTS,
+                "key": self.app_settings.YOUTUBE_API,
+            }
+
+            video_ids = []
+            while True:
+                response = await self.http_client.get(url, params=params)
+                if response.status_code != 200:
+                    logger.error(f"Playlist request failed with status {response.status_code}")
+                    break
+
+                data = response.json()
+                video_ids.extend(item['contentDetails']['videoId'] for item in data.get('items', []))
+                if not data.get('nextPageToken'):
+                    break
+                params["pageToken"] = data['nextPageToken']
+
+            logger.info(f"Found {len(video_ids)} videos in playlist {playlist_id}")
+            return video_ids
+
+        except Exception as e:
+            logger.error(f"Error fetching playlist items: {str(e)}")
+            raise
+
+    async def get_video_transcript(self, video_id: str) -> Optional[List[dict]]:
 
         try:
             available_languages = ['en', 'en-US', 'en-GB', 'ar', 'ar-SA', 'ar-EG']
-            transcript = YouTubeTranscriptApi().fetch(video_id=video_id, languages=available_languages)
+            captions_json = await self.fetch_captions_json(video_id=video_id)
+
+            transcript = TranscriptList.build(None, video_id, captions_json).find_transcript(available_languages)
+            if "&exp=xpe" in transcript._url:
+                raise PoTokenRequired(video_id)
+
+            response = await self.get_youtube_page(url=transcript._url, video_id=video_id)
+            snippets = _TranscriptParser().parse(response.text)
 
-            if not transcript.snippets:
+            if not snippets:
                 logger.error(f"No transcript available for video ID: {video_id}")
                 return None
             
@@ -77,7 +139,7 @@ class DataController(BaseController):
                     "text": snippet.text,
                     "start": snippet.start,
                     "duration": snippet.duration
-                } for snippet in transcript.snippets
+                } for snippet in snippets
             ]
     
         except NoTranscriptFound:
@@ -92,5 +154,46 @@ class DataController(BaseController):
         except Exception as e:
             logger.error(f"Error retrieving transcript: {str(e)}")
             raise
-        
 
+    async def get_video_data(self, video_id: str) -> Tuple[Optional[Dict], Optional[List[dict]]]:
+        """
+        fetch the metadata and the transcript of a video concurrently
+        """
+        return await asyncio.gather(
+            self.get_video_metadata(video_id=video_id),
+            self.get_video_transcript(video_id=video_id),
+        )
+
+    async def fetch_captions_json(self, video_id: str) -> Dict:
+        # same flow as youtube_transcript_api's TranscriptListFetcher but over the shared async client,
+        # its pure parsing helpers are reused so errors keep the library's exception types
+        fetcher = TranscriptListFetcher(http_client=None, proxy_config=None)
+
+        headers = None
+        html = unescape((await self.get_youtube_page(WATCH_URL.format(video_id=video_id), video_id)).text)
+        if 'action="https://consent.youtube.com/s"' in html:
+            match = re.search('name="v" value="(.*?)"', html)
+            if match is None:
+                raise FailedToCreateConsentCookie(video_id)
+
+            headers = {"Cookie": f"CONSENT=YES+{match.group(1)}"}
+            html = unescape((await self.get_youtube_page(WATCH_URL.format(video_id=video_id), video_id,
+                                                         headers=headers)).text)
+            if 'action="https://consent.youtube.com/s"' in html:
+                raise FailedToCreateConsentCookie(video_id)
+
+        api_key = fetcher._extract_innertube_api_key(html, video_id)
+        response = await self.get_youtube_page(
+            INNERTUBE_API_URL.format(api_key=api_key), video_id,
+            method="POST",
+            json={"context": INNERTUBE_CONTEXT, "videoId": video_id},
+            headers=headers,
+        )
+        return fetcher._extract_captions_json(response.json(), video_id)
+
+    async def get_youtube_page(self, url: str, video_id: str, method: str = "GET", **kwargs) -> httpx.Response:
+        response = await self.http_client.request(method, url, **kwargs)
+        try:
+            return response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise YouTubeRequestFailed(video_id, e)
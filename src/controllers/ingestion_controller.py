@@ -0,0 +1,385 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import List, Tuple
+from .base_controller import BaseController
+from .data_controller import DataController
+from .process_controller import TextProcessor
+from .rag_controller import RAGController
+from models import VideoModel, ChunkModel
+from models.db_schemas import Video, Chunk
+from utils.app_enums import ResponseSignals, IndexStatusEnum
+from utils.async_pipeline import iterate_batches, prefetch
+from utils.bm25 import BM25Index
+from utils import logging
+logger = logging.get_logger(__name__)
+
+class IngestionController(BaseController):
+    """
+    upload and indexing flows shared by the HTTP routes and the background job workers,
+    each returns (success, response content)
+    """
+    def __init__(self, video_model: VideoModel, chunk_model: ChunkModel, http_client, vectordb_client,
+                 generation_client, embedding_client, template_parser,
+                 query_cache=None, answer_cache=None,
+                 lexical_index_model=None, lexical_index_cache=None):
+        super().__init__()
+
+        self.video_model = video_model
+        self.chunk_model = chunk_model
+        self.http_client = http_client
+        self.embedding_client = embedding_client
+        self.rag_controller = RAGController(
+            vectordb_client=vectordb_client,
+            generation_client=generation_client,
+            embedding_client=embedding_client,
+            template_parser=template_parser,
+            query_cache=query_cache,
+            answer_cache=answer_cache,
+            lexical_index_model=lexical_index_model,
+            lexical_index_cache=lexical_index_cache,
+        )
+
+    @staticmethod
+    async def report_progress(on_progress, **counters):
+        if on_progress:
+            await on_progress(**counters)
+
+    async def upload_video(self, video_url: str, do_index: int = 0, on_progress=None) -> Tuple[bool, dict]:
+
+        data_controller = DataController(video_url=video_url, http_client=self.http_client)
+        video_id = data_controller.parse_video_id(video_url)
+        if not video_id:
+            logger.error("Invalid video URL provided")
+            return False, {"signal": ResponseSignals.INVALID_VIDEO_URL.value}
+
+        video = await self.get_stored_video(video_id=video_id)
+        if video:
+            logger.warning(f"Video with ID {video_id} already exists in the database.")
+            return True, {
+                "signal": ResponseSignals.VIDEO_ALREADY_EXISTS.value,
+                "video_id": video.video_id,
+            }
+
+        # fetch metadata and transcript concurrently
+        metadata, transcript = await data_controller.get_video_data(video_id=video_id)
+        return await self.store_video(video_id=video_id, metadata=metadata, transcript=transcript,
+                                      do_index=do_index, on_progress=on_progress)
+
+    async def get_stored_video(self, video_id: str):
+        """
+        return the video if it is already stored with its chunks, a video without chunks
+        was left by an interrupted or failed upload, so it has to be fetched again
+        """
+        video = await self.video_model.get_video(video_id=video_id)
+        if not video:
+            return None
+
+        chunks_count = video.chunks_count
+        if chunks_count is None:
+            # videos stored before the counters existed, count once and keep the result
+            chunks_count = await self.chunk_model.count_video_chunks(video=video)
+            await self.video_model.update_video_stats(video_id=video_id, chunks_count=chunks_count)
+        return video if chunks_count else None
+
+    async def store_video(self, video_id: str, metadata: dict, transcript: list,
+                          do_index: int = 0, on_progress=None) -> Tuple[bool, dict]:
+
+        if not metadata:
+            return False, {"signal": ResponseSignals.VIDEO_NOT_FOUND.value}
+
+        video = await self.video_model.create_video(
+            video=Video(
+                video_id=video_id,
+                title=metadata["title"],
+                author=metadata["author"],
+                description=metadata["description"],
+                publish_time=metadata["publish_time"],
+            )
+        )
+
+        if not transcript:
+            return False, {"signal": ResponseSignals.TRANSCRIPT_NOT_FOUND.value}
+
+        text_processor = TextProcessor()
+        processed_chunks = await text_processor.transcript_chunks(transcript=transcript)
+
+        chunks = [
+            Chunk(
+                chunk_text=chunk["text"],
+                chunk_index=i,
+                chunk_video_id=video.id,
+                start_time=chunk["start_time"],
+                end_time=chunk["end_time"],
+            ) for i, chunk in enumerate(processed_chunks)
+        ]
+
+        # a zero count marks the upload as unfinished until every chunk is stored
+        await self.video_model.update_video_stats(video_id=video_id, chunks_count=0,
+                                                  index_status=IndexStatusEnum.NOT_INDEXED.value)
+        await self.chunk_model.del_video_chunks(video=video)
+        await self.rag_controller.delete_lexical_index(video_id=video_id)
+        try:
+            inserted_items_count = await self.ingest_chunks(video=video, chunks=chunks,
+                                                            do_index=do_index, on_progress=on_progress)
+        finally:
+            # cached answers may quote chunks that were just replaced
+            self.rag_controller.invalidate_video_cache(video_id=video_id)
+
+        content = {
+            "signal": ResponseSignals.VIDEO_PROCESSING_SUCCESS.value,
+            "video_id": video.video_id,
+            "num_chunks": len(chunks)
+        }
+        if do_index:
+            content["inserted_items_count"] = inserted_items_count
+        return True, content
+
+    async def ingest_chunks(self, video: Video, chunks: List[Chunk], do_index: int = 0, on_progress=None) -> int:
+        """
+        single pass ingestion: chunks are written to mongodb, embedded and upserted in large
+        batches, the next batch is stored and embedded while the previous one is upserted
+        """
+        batch_size = self.app_settings.INGEST_BATCH_SIZE
+        prefetch_batches = self.app_settings.INGEST_PREFETCH_BATCHES
+
+        async def stored_batches():
+            async for batch in iterate_batches(chunks, batch_size=batch_size):
+                await self.chunk_model.insert_chunks(chunks=batch, batch_size=batch_size)
+                await self.report_progress(on_progress, chunks_created=len(batch))
+                yield batch
+
+        if not do_index:
+            async for _ in stored_batches():
+                pass
+            await self.video_model.update_video_stats(video_id=video.video_id, chunks_count=len(chunks))
+            return 0
+
+        await self.video_model.update_video_stats(video_id=video.video_id,
+                                                  index_status=IndexStatusEnum.INDEXING.value)
+        collection_name = self.rag_controller.create_collection_name(video_id=video.video_id)
+        await self.rag_controller.create_vdb_collection(
+            video_id=video.video_id,
+            embedding_size=self.embedding_client.embedding_size,
+            do_reset=True,
+        )
+
+        async def embedded_batches():
+            async for batch in prefetch(stored_batches(), buffer_size=prefetch_batches):
+                vectors = await self.rag_controller.embed_chunks(chunks=batch)
+                await self.report_progress(on_progress, chunks_embedded=len(batch))
+                yield batch, vectors
+
+        inserted_items_count = 0
+        try:
+            async for batch, vectors in prefetch(embedded_batches(), buffer_size=prefetch_batches):
+                inserted_items_count += await self.rag_controller.upsert_chunks(chunks=batch, vectors=vectors,
+                                                                                collection_name=collection_name,
+                                                                                video=video)
+                await self.report_progress(on_progress, points_upserted=len(batch))
+
+            lexical_index = BM25Index()
+            self.rag_controller.add_to_lexical_index(lexical_index=lexical_index, chunks=chunks)
+            await self.rag_controller.save_lexical_index(video=video, lexical_index=lexical_index)
+        except BaseException:
+            await self.video_model.update_video_stats(video_id=video.video_id,
+                                                      index_status=IndexStatusEnum.FAILED.value)
+            raise
+
+        await self.video_model.update_video_stats(
+            video_id=video.video_id,
+            chunks_count=len(chunks),
+            vectors_count=inserted_items_count,
+            index_status=IndexStatusEnum.INDEXED.value,
+            last_indexed_at=datetime.now(timezone.utc),
+        )
+        return inserted_items_count
+
+    async def index_video(self, video_id: str, do_reset: int = 0, on_progress=None) -> Tuple[bool, dict]:
+        video = await self.video_model.get_video(video_id=video_id)
+        if not video:
+            return False, {"signal": ResponseSignals.VIDEO_NOT_FOUND.value}
+
+        collection_name = self.rag_controller.create_collection_name(video_id=video.video_id)
+        await self.rag_controller.create_vdb_collection(
+            video_id=video.video_id,
+            embedding_size=self.embedding_client.embedding_size,
+            do_reset=do_reset,
+        )
+
+        await self.video_model.update_video_stats(video_id=video.video_id,
+                                                  index_status=IndexStatusEnum.INDEXING.value)
+        inserted_items_count = 0
+        chunks_count = 0
+
+        async def collect(done_pages):
+            count = sum(page.result() for page in done_pages)
+            await self.report_progress(on_progress, chunks_embedded=count, points_upserted=count)
+            return count
+
+        # keep several pages in flight so the embedding scheduler can overlap their requests
+        pending_pages = set()
+        lexical_index = BM25Index()
+        try:
+            async for page_chunks in self.chunk_model.iter_video_chunks(video=video,
+                                                                        batch_size=self.app_settings.INDEXING_BATCH_SIZE):
+                logger.info(f"Fetched {len(page_chunks)} chunks from database")
+                chunks_count += len(page_chunks)
+                self.rag_controller.add_to_lexical_index(lexical_index=lexical_index, chunks=page_chunks)
+
+                pending_pages.add(asyncio.create_task(self.rag_controller.index_into_vdb_collection(
+                    chunks=page_chunks,
+                    collection_name=collection_name,
+                    video=video,
+                )))
+
+                if len(pending_pages) >= self.app_settings.EMBEDDING_MAX_CONCURRENCY:
+                    done_pages, pending_pages = await asyncio.wait(pending_pages, return_when=asyncio.FIRST_COMPLETED)
+                    inserted_items_count += await collect(done_pages)
+                    logger.info(f"Inserted {inserted_items_count} items so far...")
+
+            if pending_pages:
+                done_pages, pending_pages = await asyncio.wait(pending_pages)
+                inserted_items_count += await collect(done_pages)
+
+            await self.rag_controller.save_lexical_index(video=video, lexical_index=lexical_index)
+        except BaseException:
+            await self.video_model.update_video_stats(video_id=video.video_id,
+                                                      index_status=IndexStatusEnum.FAILED.value)
+            raise
+        finally:
+            for page in pending_pages:
+                page.cancel()
+            self.rag_controller.invalidate_video_cache(video_id=video.video_id)
+
+        await self.video_model.update_video_stats(
+            video_id=video.video_id,
+            chunks_count=chunks_count,
+            vectors_count=inserted_items_count,
+            index_status=IndexStatusEnum.INDEXED.value,
+            last_indexed_at=datetime.now(timezone.utc),
+        )
+
+        return True, {
+            "signal": ResponseSignals.VECTORDB_INSERT_SUCCESS.value,
+            "inserted_items_count": inserted_items_count
+        }
+
+    async def bulk_upload(self, video_urls: List[str] = None, playlist_id: str = None,
+                          do_index: int = 1, on_progress=None) -> Tuple[bool, dict]:
+        """
+        ingest many videos through a pipeline of transcript fetching and chunking/indexing
+        stages, each one with its own bounded number of workers
+        """
+        started_at = time.monotonic()
+        data_controller = DataController(http_client=self.http_client)
+        results = []
+
+        def record(video_id: str, success: bool, signal: str, **details):
+            results.append({"video_id": video_id, "success": success, "signal": signal, **details})
+
+        video_ids = []
+        for video_url in video_urls or []:
+            video_id = data_controller.parse_video_id(video_url)
+            if video_id:
+                video_ids.append(video_id)
+            else:
+                record(None, False, ResponseSignals.INVALID_VIDEO_URL.value, video_url=video_url)
+
+        if playlist_id:
+            video_ids.extend(await data_controller.get_playlist_video_ids(playlist_id=playlist_id))
+        video_ids = list(dict.fromkeys(video_ids))
+
+        if not video_ids:
+            return False, {"signal": ResponseSignals.BULK_NO_VIDEOS.value, "results": results}
+
+        await self.report_progress(on_progress, videos_total=len(video_ids))
+
+        pending_ids = []
+        for video_id in video_ids:
+            if await self.get_stored_video(video_id=video_id):
+                record(video_id, True, ResponseSignals.VIDEO_ALREADY_EXISTS.value)
+            else:
+                pending_ids.append(video_id)
+
+        # one YouTube Data API call per 50 videos instead of one per video
+        videos_metadata = await data_controller.get_videos_metadata(video_ids=pending_ids)
+
+        fetch_queue = asyncio.Queue()
+        # bounded so fetching waits for indexing instead of holding every transcript in memory
+        index_queue = asyncio.Queue(maxsize=self.app_settings.BULK_INDEX_CONCURRENCY)
+        for video_id in pending_ids:
+            fetch_queue.put_nowait(video_id)
+
+        async def finish(video_id: str, success: bool, signal: str, **details):
+            record(video_id, success, signal, **details)
+            await self.report_progress(on_progress, **{"videos_done" if success else "videos_failed": 1})
+
+        async def fetch_stage():
+            while not fetch_queue.empty():
+                video_id = fetch_queue.get_nowait()
+                if video_id not in videos_metadata:
+                    await finish(video_id, False, ResponseSignals.VIDEO_NOT_FOUND.value)
+                    continue
+
+                try:
+                    transcript = await data_controller.get_video_transcript(video_id=video_id)
+                except Exception as e:
+                    logger.error(f"Error fetching transcript of video {video_id}: {e}")
+                    await finish(video_id, False, ResponseSignals.TRANSCRIPT_NOT_FOUND.value, error=str(e))
+                    continue
+
+                await index_queue.put((video_id, transcript))
+
+        async def index_stage():
+            # chunks of each video stream through mongodb, the embedder and qdrant in one pass
+            while True:
+                fetched = await index_queue.get()
+                if fetched is None:
+                    return
+
+                video_id, transcript = fetched
+                try:
+                    success, content = await self.store_video(video_id=video_id,
+                                                              metadata=videos_metadata[video_id],
+                                                              transcript=transcript,
+                                                              do_index=do_index,
+                                                              on_progress=on_progress)
+                except Exception as e:
+                    logger.error(f"Error ingesting video {video_id}: {e}")
+                    await finish(video_id, False, ResponseSignals.VIDEO_PROCESSING_FAILED.value, error=str(e))
+                    continue
+
+                if not success:
+                    await finish(video_id, False, content["signal"])
+                    continue
+
+                await finish(video_id, True, content["signal"], num_chunks=content["num_chunks"],
+                             inserted_items_count=content.get("inserted_items_count", 0))
+
+        fetch_workers = [asyncio.create_task(fetch_stage())
+                         for _ in range(self.app_settings.BULK_FETCH_CONCURRENCY)]
+        index_workers = [asyncio.create_task(index_stage())
+                         for _ in range(self.app_settings.BULK_INDEX_CONCURRENCY)]
+        try:
+            await asyncio.gather(*fetch_workers)
+            for _ in index_workers:
+                await index_queue.put(None)
+            await asyncio.gather(*index_workers)
+        finally:
+            for worker in fetch_workers + index_workers:
+                worker.cancel()
+
+        elapsed_seconds = time.monotonic() - started_at
+        succeeded = sum(1 for result in results if result["success"])
+
+        logger.info(f"Bulk upload finished: {succeeded}/{len(results)} videos in {elapsed_seconds:.1f}s")
+        return True, {
+            "signal": ResponseSignals.BULK_PROCESSING_DONE.value,
+            "videos_total": len(results),
+            "videos_succeeded": succeeded,
+            "videos_failed": len(results) - succeeded,
+            "elapsed_seconds": round(elapsed_seconds, 2),
+            "videos_per_minute": round(succeeded * 60 / elapsed_seconds, 2) if elapsed_seconds else 0.0,
+            "results": results,
+        }
@@ -0,0 +1,153 @@
+import asyncio
+from .base_controller import BaseController
+from .ingestion_controller import IngestionController
+from models.db_schemas import Job
+from utils.app_enums import JobTypeEnum
+from utils import logging
+logger = logging.get_logger(__name__)
+
+class JobController(BaseController):
+    """
+    pool of background workers consuming ingestion jobs stored in mongodb
+    """
+    def __init__(self, app):
+        super().__init__()
+
+        self.app = app
+        self.job_model = None
+        self.workers = []
+        self.stopping = False
+        self.wakeup = asyncio.Event()
+
+        self.handlers = {
+            JobTypeEnum.UPLOAD_URL.value: self.run_upload_job,
+            JobTypeEnum.INDEX.value: self.run_index_job,
+            JobTypeEnum.BULK_UPLOAD.value: self.run_bulk_upload_job,
+        }
+
+    async def start(self):
+        self.job_model = self.app.job_model
+        self.workers = [
+            asyncio.create_task(self.worker_loop(worker_no=i))
+            for i in range(self.app_settings.JOB_WORKERS)
+        ]
+        logger.info(f"Started {len(self.workers)} job workers")
+
+    async def stop(self):
+        """
+        stop claiming new jobs and let the running ones finish, jobs still running
+        after the timeout are cancelled and given back to the queue
+        """
+        self.stopping = True
+        self.wakeup.set()
+        if not self.workers:
+            return
+
+        _, pending = await asyncio.wait(self.workers, timeout=self.app_settings.JOB_SHUTDOWN_TIMEOUT_SECONDS)
+        for worker in pending:
+            worker.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        logger.info(f"Job workers stopped, {len(pending)} running jobs requeued")
+
+    async def enqueue(self, job_type: str, payload: dict) -> Job:
+        job = await self.job_model.create_job(job=Job(job_type=job_type, payload=payload))
+        self.wakeup.set()
+        logger.info(f"Enqueued {job_type} job {job.id}")
+        return job
+
+    async def worker_loop(self, worker_no: int):
+        while not self.stopping:
+            self.wakeup.clear()
+            try:
+                job = await self.job_model.claim_next_job(lease_seconds=self.app_settings.JOB_LEASE_SECONDS)
+            except Exception as e:
+                logger.error(f"Job worker {worker_no} failed to claim a job: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=self.app_settings.JOB_POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            logger.info(f"Job worker {worker_no} running {job.job_type} job {job.id} (attempt {job.attempts})")
+            await self.execute(job=job)
+
+    async def execute(self, job: Job):
+        heartbeat = asyncio.create_task(self.renew_lease(job=job))
+        try:
+            if job.attempts > self.app_settings.JOB_MAX_ATTEMPTS:
+                await self.job_model.fail_job(job_id=job.id, error="job exceeded its maximum attempts")
+                return
+
+            handler = self.handlers.get(job.job_type)
+            if handler is None:
+                await self.job_model.fail_job(job_id=job.id, error=f"unsupported job type {job.job_type}")
+                return
+
+            async def on_progress(**counters):
+                await self.job_model.increment_progress(job_id=job.id, **counters)
+
+            success, content = await handler(job=job, on_progress=on_progress)
+            if success:
+                await self.job_model.complete_job(job_id=job.id, result=content)
+            else:
+                await self.job_model.fail_job(job_id=job.id, error=content.get("signal"), result=content)
+
+        except asyncio.CancelledError:
+            await self.job_model.requeue_job(job_id=job.id)
+            raise
+
+        except Exception as e:
+            logger.error(f"Job {job.id} failed on attempt {job.attempts}: {e}")
+            if job.attempts < self.app_settings.JOB_MAX_ATTEMPTS:
+                await self.job_model.requeue_job(job_id=job.id)
+            else:
+                await self.job_model.fail_job(job_id=job.id, error=str(e))
+
+        finally:
+            heartbeat.cancel()
+
+    async def renew_lease(self, job: Job):
+        # keep the lease alive while the job runs, an expired lease means the worker died
+        while True:
+            await asyncio.sleep(self.app_settings.JOB_LEASE_SECONDS / 3)
+            await self.job_model.renew_lease(job_id=job.id, lease_seconds=self.app_settings.JOB_LEASE_SECONDS)
+
+    def create_ingestion_controller(self) -> IngestionController:
+        return IngestionController(
+            video_model=self.app.video_model,
+            chunk_model=self.app.chunk_model,
+            http_client=self.app.http_client,
+            vectordb_client=self.app.vectordb_client,
+            generation_client=self.app.generation_client,
+            embedding_client=self.app.embedding_client,
+            template_parser=self.app.template_parser,
+            query_cache=self.app.query_cache,
+            answer_cache=self.app.answer_cache,
+            lexical_index_model=self.app.lexical_index_model,
+            lexical_index_cache=self.app.lexical_index_cache,
+        )
+
+    async def run_upload_job(self, job: Job, on_progress):
+        return await self.create_ingestion_controller().upload_video(
+            video_url=job.payload["video_url"],
+            do_index=job.payload.get("do_index", 0),
+            on_progress=on_progress,
+        )
+
+    async def run_index_job(self, job: Job, on_progress):
+        return await self.create_ingestion_controller().index_video(
+            video_id=job.payload["video_id"],
+            do_reset=job.payload.get("do_reset", 0),
+            on_progress=on_progress,
+        )
+
+    async def run_bulk_upload_job(self, job: Job, on_progress):
+        return await self.create_ingestion_controller().bulk_upload(
+            video_urls=job.payload.get("video_urls"),
+            playlist_id=job.payload.get("playlist_id"),
+            do_index=job.payload.get("do_index", 1),
+            on_progress=on_progress,
+        )
@@ -1,6 +1,7 @@
 from .base_controller import BaseController
+from collections import deque
 from typing import List
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from utils.thread_pool import run_blocking
 from utils import logging
 logger = logging.get_logger(__name__)
 
@@ -8,26 +9,61 @@ class TextProcessor(BaseController):
     def __init__(self):
         super().__init__()
 
-    async def transcript_chunks(self, transcript: list, chunk_size:int= 200, chunk_overlap:int= 50) -> List[str]:
-
+    async def transcript_chunks(self, transcript: list, chunk_size:int= 200, chunk_overlap:int= 50) -> List[dict]:
+        """
+        pack transcript snippets into chunks of text with their start_time and end_time,
+        long transcripts are chunked on the thread pool to keep the event loop free
+        """
         try:
-            strings = []
-            for item in transcript:
-                strings.append(f"{item['start']}: {item['text']}")
-
-            strings = '\n'.join(strings)
-
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-                length_function=len,
-                is_separator_regex=False,)
-
-            chunks = text_splitter.create_documents([strings])
+            if len(transcript) >= self.app_settings.CHUNKING_OFFLOAD_MIN_SNIPPETS:
+                chunks = await run_blocking(self.pack_snippets, transcript, chunk_size, chunk_overlap)
+            else:
+                chunks = self.pack_snippets(transcript, chunk_size, chunk_overlap)
 
             logger.info(f"Created {len(chunks)} chunks from transcript")
-            return [chunk.page_content for chunk in chunks]
+            return chunks
 
         except Exception as e:
             logger.error(f"Error chunking transcript: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+    @staticmethod
+    def pack_snippets(transcript: list, chunk_size: int, chunk_overlap: int) -> List[dict]:
+        """
+        single pass over the snippets: a window grows until the next snippet would exceed
+        chunk_size, is emitted, then shrinks from the front down to chunk_overlap characters,
+        snippets are never cut so chunk boundaries fall between sentences of the transcript
+        """
+        chunks = []
+        window = deque()
+        window_size = 0
+
+        def emit():
+            chunks.append({
+                "text": " ".join(text for text, _, _ in window),
+                "start_time": window[0][1],
+                "end_time": window[-1][2],
+            })
+
+        for snippet in transcript:
+            text = " ".join(snippet["text"].split())
+            if not text:
+                continue
+
+            start = float(snippet["start"])
+            end = start + float(snippet.get("duration") or 0.0)
+            size = len(text) + 1
+
+            if window and window_size + size > chunk_size:
+                emit()
+                while window and (window_size + size > chunk_size or window_size > chunk_overlap):
+                    window_size -= len(window.popleft()[0]) + 1
+
+            window.append((text, start, end))
+            window_size += size
+
+        # the last snippet is always still unemitted
+        if window:
+            emit()
+
+        return chunks
@@ -1,15 +1,27 @@
 from .base_controller import BaseController
-from models.db_schemas import Video, Chunk
+from models.db_schemas import Video, Chunk, RetrievedDocument
+from datetime import datetime
 from AI.LLM.LLMEnums import DocumentTypeEnum
+from AI.LLM.LLMExceptions import LLMStreamError
+from AI.VectorDB import CollectionNotFoundError
+from utils.app_enums import ResponseSignals, SearchModeEnum
+from utils.bm25 import BM25Index, reciprocal_rank_fusion
 from typing import List
+import asyncio
 import json
+import numpy as np
 from utils import logging
 logger = logging.get_logger(__name__)
 
 class RAGController(BaseController):
 
+    # query cache namespace of searches across all videos, never clashes with an 11 character video id
+    ALL_VIDEOS_NAMESPACE = "*"
+
     def __init__(self, vectordb_client, generation_client, 
-                 embedding_client, template_parser):
+                 embedding_client, template_parser,
+                 query_cache=None, answer_cache=None,
+                 lexical_index_model=None, lexical_index_cache=None):
         super().__init__()
 
         self.vectordb_client = vectordb_client
@@ -17,9 +29,42 @@ class RAGController(BaseController):
         self.embedding_client = embedding_client
         self.template_parser = template_parser
 
+        # app level TTLCaches shared by every request, keyed by video id
+        self.query_cache = query_cache
+        self.answer_cache = answer_cache
+
+        # BM25 indexes persisted per video, and the ones already loaded
+        self.lexical_index_model = lexical_index_model
+        self.lexical_index_cache = lexical_index_cache
+
     def create_collection_name(self, video_id: str):
         return f"collection_{video_id}".strip()
     
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return " ".join(query.casefold().split())
+
+    def invalidate_video_cache(self, video_id: str):
+        """
+        drop the cached query vectors and answers of a video once its chunks or vectors change
+        """
+        for cache in (self.query_cache, self.answer_cache, self.lexical_index_cache):
+            if cache is not None:
+                cache.invalidate(namespace=video_id)
+
+    @staticmethod
+    def format_document_text(doc) -> str:
+        # timestamps are kept out of the embedded text and only added to the prompt
+        if doc.start_time is None:
+            return doc.text
+
+        def timestamp(seconds: float) -> str:
+            minutes, seconds = divmod(int(seconds), 60)
+            hours, minutes = divmod(minutes, 60)
+            return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+        return f"[{timestamp(doc.start_time)} - {timestamp(doc.end_time or doc.start_time)}] {doc.text}"
+
     async def reset_vdb_collection(self, video_id: str):
         collection_name = self.create_collection_name(video_id=video_id)
         return await self.vectordb_client.delete_collection(collection_name=collection_name)
@@ -41,44 +86,98 @@ class RAGController(BaseController):
             self,
             chunks: List[Chunk],
             collection_name: str,
+            video: Video = None,
     ):
         try:
-            texts = [c.chunk_text for c in chunks]
-            vectors = [
-                await self.embedding_client.embed(text=text, document_type=DocumentTypeEnum.DOCUMENT.value)
-                for text in texts
-            ]
-
-            if not vectors or len(vectors) == 0:
-                logger.error(f"Error generating some embedding vectors for chunks")
-                raise
-
-            logger.info(f"Generated {len(vectors)} embedding vectors for {len(texts)} chunks")
-
-            # insert into vector db
-            await self.vectordb_client.insert_many(
-                collection_name=collection_name,
-                texts=texts,
-                vectors=vectors,
-                mongodb_ids=[str(c.id) for c in chunks]
-            )
-            logger.info(f"Inserted {len(texts)} items into vector DB collection: {collection_name}")
+            vectors = await self.embed_chunks(chunks=chunks)
+            return await self.upsert_chunks(chunks=chunks, vectors=vectors, collection_name=collection_name,
+                                            video=video)
         
         except Exception as e:
             logger.error(f"Error indexing into vector DB: {e}")
             raise
 
-    async def search_query(self, video: Video, query: str, limit: int = 5):
+    async def embed_chunks(self, chunks: List[Chunk]):
+        texts = [c.chunk_text for c in chunks]
+        vectors = await self.embedding_client.embed_many(
+            texts=texts,
+            document_type=DocumentTypeEnum.DOCUMENT.value
+        )
+
+        if vectors is None or len(vectors) != len(texts):
+            logger.error(f"Error generating some embedding vectors for chunks")
+            raise ValueError("Embedding vectors count does not match chunks count")
+
+        logger.info(f"Generated {len(vectors)} embedding vectors for {len(texts)} chunks")
+        return vectors
+
+    @staticmethod
+    def video_payload(video: Video) -> dict:
+        # filterable fields stored next to every chunk vector
+        if video is None:
+            return {}
+        return {"video_id": video.video_id, "author": video.author, "publish_time": video.publish_time}
+
+    async def upsert_chunks(self, chunks: List[Chunk], vectors: np.ndarray, collection_name: str, video: Video = None):
+        video_payload = self.video_payload(video)
+        await self.vectordb_client.insert_many(
+            collection_name=collection_name,
+            texts=[c.chunk_text for c in chunks],
+            vectors=vectors,
+            mongodb_ids=[str(c.id) for c in chunks],
+            metadatas=[{"start_time": c.start_time, "end_time": c.end_time, **video_payload} for c in chunks],
+            batch_size=self.app_settings.VECTOR_DB_UPSERT_BATCH_SIZE,
+        )
+        logger.info(f"Inserted {len(chunks)} items into vector DB collection: {collection_name}")
+        return len(chunks)
+
+    def resolve_search_mode(self, mode: str = None) -> str:
+        return mode or self.app_settings.RETRIEVAL_DEFAULT_MODE
+
+    async def search_query(self, video: Video, query: str, limit: int = 5, mode: str = None,
+                           hnsw_ef: int = None, exact: bool = False):
+        """
+        dense (vectors), sparse (BM25) or hybrid retrieval, hybrid ranks limit * factor candidates
+        of both with reciprocal rank fusion so exact terms the embedding misses still come first
+        """
+        mode = self.resolve_search_mode(mode)
+        if mode == SearchModeEnum.SPARSE.value:
+            return await self.lexical_search(video=video, query=query, limit=limit)
+        if mode != SearchModeEnum.HYBRID.value:
+            return await self.dense_search(video=video, query=query, limit=limit, hnsw_ef=hnsw_ef, exact=exact)
+
+        candidates = limit * self.app_settings.RETRIEVAL_HYBRID_CANDIDATES_FACTOR
+        dense_results, sparse_results = await asyncio.gather(
+            self.dense_search(video=video, query=query, limit=candidates, hnsw_ef=hnsw_ef, exact=exact),
+            self.lexical_search(video=video, query=query, limit=candidates),
+        )
+        if not sparse_results:
+            return dense_results[:limit] if dense_results else None
+        if not dense_results:
+            return sparse_results[:limit]
+
+        # the same chunk found by both retrievers is merged on its mongodb id
+        documents = {}
+        rankings = []
+        for results in (dense_results, sparse_results):
+            keys = [doc.chunk_id or doc.text for doc in results]
+            for key, doc in zip(keys, results):
+                documents.setdefault(key, doc)
+            rankings.append(keys)
+
+        fused = reciprocal_rank_fusion(rankings, k=self.app_settings.RETRIEVAL_RRF_K)
+        return [documents[key].copy(update={"score": score}) for key, score in fused[:limit]]
+
+    async def dense_search(self, video: Video, query: str, limit: int = 5,
+                           hnsw_ef: int = None, exact: bool = False):
 
         try: 
             collection_name = self.create_collection_name(video_id=video.video_id)
 
             # get text embedding vector
-            vector = await self.embedding_client.embed(
-                text=query,
-                document_type=DocumentTypeEnum.QUERY.value)
+            vector = await self.embed_query(video_id=video.video_id, query=query)
 
-            if not vector or len(vector) == 0:
+            if vector is None or len(vector) == 0:
                 logger.error(f"Error generating embedding vector for query: {query}")
                 raise
 
@@ -86,7 +185,9 @@ class RAGController(BaseController):
             results = await self.vectordb_client.search(
                 collection_name=collection_name,
                 query_vector=vector,
-                limit=limit
+                limit=limit,
+                hnsw_ef=hnsw_ef,
+                exact=exact,
             )
 
             return results
@@ -95,7 +196,147 @@ class RAGController(BaseController):
             logger.error(f"Error searching vector DB: {e}")
             raise
     
-    async def answer_question(self, video: Video, query: str, limit: int = 5):
+    async def get_lexical_index(self, video_id: str):
+
+        async def compute():
+            document = await self.lexical_index_model.get_index(video_id=video_id)
+            if document is None:
+                return None
+            return BM25Index.from_document(document)
+
+        if self.lexical_index_model is None:
+            return None
+        if self.lexical_index_cache is None:
+            return await compute()
+        return await self.lexical_index_cache.get_or_compute(namespace=video_id, key="bm25", compute=compute)
+
+    async def lexical_search(self, video: Video, query: str, limit: int = 5):
+        lexical_index = await self.get_lexical_index(video_id=video.video_id)
+        if lexical_index is None:
+            logger.warning(f"No lexical index for video {video.video_id}, re-index it to enable sparse search")
+            return None
+
+        hits = lexical_index.search(query=query, limit=limit)
+        if not hits:
+            return None
+
+        return [
+            RetrievedDocument(
+                text=lexical_index.texts[position],
+                score=score,
+                start_time=lexical_index.start_times[position],
+                end_time=lexical_index.end_times[position],
+                video_id=video.video_id,
+                chunk_id=lexical_index.chunk_ids[position],
+            )
+            for position, score in hits
+        ]
+
+    @staticmethod
+    def add_to_lexical_index(lexical_index: BM25Index, chunks: List[Chunk]):
+        for chunk in chunks:
+            lexical_index.add(chunk_id=str(chunk.id), text=chunk.chunk_text,
+                              start_time=chunk.start_time, end_time=chunk.end_time)
+
+    async def save_lexical_index(self, video: Video, lexical_index: BM25Index):
+        if self.lexical_index_model is None:
+            return
+        await self.lexical_index_model.save_index(video_id=video.video_id, document=lexical_index.to_document())
+        logger.info(f"Saved lexical index of {len(lexical_index)} chunks for video {video.video_id}")
+
+    async def delete_lexical_index(self, video_id: str):
+        if self.lexical_index_model is not None:
+            await self.lexical_index_model.delete_index(video_id=video_id)
+
+    async def search_videos(self, query: str, limit: int = 10, group_size: int = 3,
+                            video_ids: List[str] = None, authors: List[str] = None,
+                            published_after: datetime = None, published_before: datetime = None):
+        """
+        search all videos (or the ones matching the filters) at once, results are grouped by video
+        """
+        try:
+            vector = await self.embed_query(video_id=self.ALL_VIDEOS_NAMESPACE, query=query)
+
+            if vector is None or len(vector) == 0:
+                logger.error(f"Error generating embedding vector for query: {query}")
+                raise ValueError("Empty embedding vector for query")
+
+            return await self.vectordb_client.search_videos(
+                query_vector=vector,
+                limit=limit,
+                group_size=group_size,
+                video_ids=video_ids,
+                authors=authors,
+                published_after=published_after,
+                published_before=published_before,
+            )
+
+        except Exception as e:
+            logger.error(f"Error searching videos in vector DB: {e}")
+            raise
+
+    async def embed_query(self, video_id: str, query: str):
+
+        async def compute():
+            return await self.embedding_client.embed(
+                text=query,
+                document_type=DocumentTypeEnum.QUERY.value)
+
+        if self.query_cache is None:
+            return await compute()
+        return await self.query_cache.get_or_compute(namespace=video_id,
+                                                     key=self.normalize_query(query),
+                                                     compute=compute)
+
+    def answer_cache_key(self, query: str, limit: int, mode: str = None) -> tuple:
+        return (self.normalize_query(query), limit, self.resolve_search_mode(mode),
+                self.generation_client.generation_model_id, self.template_parser.version)
+
+    async def answer_question(self, video: Video, query: str, limit: int = 5, mode: str = None):
+        """
+        answer from the cache when the same question was asked recently with the same model and
+        templates, identical questions arriving together share one search and one generation
+        """
+        if self.answer_cache is None:
+            answer, full_prompt, _ = await self.generate_answer(video=video, query=query, limit=limit, mode=mode)
+            return answer, full_prompt
+
+        async def compute():
+            answer, full_prompt, retrieved_documents = await self.generate_answer(video=video, query=query,
+                                                                                  limit=limit, mode=mode)
+            if not answer:
+                return None
+            return answer, full_prompt, retrieved_documents
+
+        result = await self.answer_cache.get_or_compute(namespace=video.video_id,
+                                                        key=self.answer_cache_key(query=query, limit=limit,
+                                                                                  mode=mode),
+                                                        compute=compute)
+        if result is None:
+            return None, None
+        return result[0], result[1]
+
+    def construct_answer_prompts(self, video: Video, query: str, retrieved_documents: List[RetrievedDocument]):
+        system_prompt = self.template_parser.get("rag", "system_prompt")
+
+        documents_prompts = self.template_parser.render_many("rag", "document_prompt", [
+            {
+                "doc_num": idx + 1,
+                "chunk_text": self.format_document_text(doc),
+            }
+            for idx, doc in enumerate(retrieved_documents)
+        ])
+
+        footer_prompt = self.template_parser.get("rag", "footer_prompt", {
+            "title": video.title,
+            "author": video.author,
+            "query": query,
+        })
+
+        full_prompt = "\n\n".join([documents_prompts,  footer_prompt])
+        return system_prompt, full_prompt
+
+    async def generate_answer(self, video: Video, query: str, limit: int = 5, mode: str = None):
         
         try:
             answer, full_prompt = None, None
@@ -104,30 +345,16 @@ class RAGController(BaseController):
             retrieved_documents = await self.search_query(
                 video=video,
                 query=query,
-                limit=limit
+                limit=limit,
+                mode=mode,
             )
 
             if not retrieved_documents or len(retrieved_documents) == 0:
-                return answer, full_prompt
+                return answer, full_prompt, retrieved_documents
             
             # Construct LLM prompt
-            system_prompt = self.template_parser.get("rag", "system_prompt")
-
-            documents_prompts = "\n".join([
-                self.template_parser.get("rag", "document_prompt", {
-                    "doc_num": idx + 1,
-                    "chunk_text": doc.text,
-                })
-                for idx, doc in enumerate(retrieved_documents)
-            ])
-
-            footer_prompt = self.template_parser.get("rag", "footer_prompt", {
-                "title": video.title,
-                "author": video.author,
-                "query": query,
-            })
-
-            full_prompt = "\n\n".join([documents_prompts,  footer_prompt])
+            system_prompt, full_prompt = self.construct_answer_prompts(video=video, query=query,
+                                                                       retrieved_documents=retrieved_documents)
 
             # Retrieve the Answer
             answer = await self.generation_client.generate(
@@ -135,8 +362,62 @@ class RAGController(BaseController):
                 system_prompt=system_prompt
             )
 
-            return answer, full_prompt
+            return answer, full_prompt, retrieved_documents
 
         except Exception as e:
             logger.error(f"Error answering RAG question: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    async def stream_answer(self, video: Video, query: str, limit: int = 5, mode: str = None):
+        """
+        yield the retrieved documents as soon as the search returns, then the answer text as the
+        model generates it, closing this generator (client gone) closes the upstream generation
+        """
+        full_key = None
+        if self.answer_cache is not None:
+            key = self.answer_cache_key(query=query, limit=limit, mode=mode)
+            full_key = self.answer_cache.make_key(namespace=video.video_id, key=key)
+
+            cached = self.answer_cache.get(namespace=video.video_id, key=key)
+            if cached is not None:
+                answer, _, retrieved_documents = cached
+                yield {"event": "documents", "documents": [doc.dict() for doc in retrieved_documents]}
+                yield {"event": "token", "text": answer}
+                yield {"event": "done", "signal": ResponseSignals.RAG_ANSWER_SUCCESS.value}
+                return
+
+        try:
+            retrieved_documents = await self.search_query(video=video, query=query, limit=limit, mode=mode)
+        except CollectionNotFoundError:
+            yield {"event": "done", "signal": ResponseSignals.VECTORDB_COLLECTION_NOT_FOUND.value}
+            return
+
+        if not retrieved_documents:
+            yield {"event": "done", "signal": ResponseSignals.RAG_NO_ANSWER.value}
+            return
+
+        yield {"event": "documents", "documents": [doc.dict() for doc in retrieved_documents]}
+
+        system_prompt, full_prompt = self.construct_answer_prompts(video=video, query=query,
+                                                                   retrieved_documents=retrieved_documents)
+        tokens = self.generation_client.generate_stream(user_prompt=full_prompt, system_prompt=system_prompt)
+        answer_parts = []
+        try:
+            async for token in tokens:
+                answer_parts.append(token)
+                yield {"event": "token", "text": token}
+        except LLMStreamError:
+            # what was streamed is a truncated answer, it is reported as such and never cached
+            yield {"event": "done", "signal": ResponseSignals.RAG_ANSWER_INTERRUPTED.value}
+            return
+        finally:
+            await tokens.aclose()
+
+        answer = "".join(answer_parts)
+        if not answer:
+            yield {"event": "done", "signal": ResponseSignals.RAG_NO_ANSWER.value}
+            return
+
+        if full_key is not None:
+            self.answer_cache.put_if_current(full_key=full_key, value=(answer, full_prompt, retrieved_documents))
+        yield {"event": "done", "signal": ResponseSignals.RAG_ANSWER_SUCCESS.value}
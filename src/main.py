@@ -1,45 +1,118 @@
-from fastapi import FastAPI
-from routes import base, data, rag
-from motor.motor_asyncio import AsyncIOMotorClient
+from utils.startup_timing import startup_timer
+
+with startup_timer.measure("import", "fastapi, httpx, motor"):
+    from fastapi import FastAPI
+    import httpx
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+with startup_timer.measure("import", "routes, controllers, models"):
+    from routes import base, data, rag, jobs
+    from controllers import JobController
+    from models import VideoModel, ChunkModel, JobModel, EmbeddingCacheModel, LexicalIndexModel
+
+with startup_timer.measure("import", "AI factories"):
+    from AI.VectorDB.VDBFactory import VDBFactory
+    from AI.LLM.LLMFactory import LLMProviderFactory
+    from AI.LLM.EmbeddingScheduler import EmbeddingScheduler
+    from AI.LLM.EmbeddingCache import EmbeddingCache
+    from AI.LLM.templates import TemplateParser
+
 from utils.app_config import get_settings
-from AI.VectorDB.VDBFactory import VDBFactory
-from AI.LLM.LLMFactory import LLMProviderFactory
-from AI.LLM.templates import TemplateParser
+from utils.thread_pool import shutdown_executor
+from utils.ttl_cache import TTLCache
 
 app = FastAPI()
 
 @app.on_event("startup")
 async def startup():
     settings = get_settings()
-    app.mongodb_conn = AsyncIOMotorClient(settings.MONGO_URL)
-    app.mongodb_client = app.mongodb_conn[settings.MONGO_DB]
+    with startup_timer.measure("step", "mongodb client"):
+        app.mongodb_conn = AsyncIOMotorClient(settings.MONGO_URL)
+        app.mongodb_client = app.mongodb_conn[settings.MONGO_DB]
+
+    # models live as long as the app, their indexes are ensured here once instead of per request
+    with startup_timer.measure("step", "mongodb indexes"):
+        app.video_model = await VideoModel.get_instance(db_client=app.mongodb_client)
+        app.chunk_model = await ChunkModel.get_instance(db_client=app.mongodb_client)
+        app.job_model = await JobModel.get_instance(db_client=app.mongodb_client)
+        app.lexical_index_model = await LexicalIndexModel.get_instance(db_client=app.mongodb_client)
+
+    # shared pooled http client for YouTube metadata and transcripts
+    app.http_client = httpx.AsyncClient(
+        timeout=settings.HTTP_TIMEOUT_SECONDS,
+        limits=httpx.Limits(max_connections=settings.HTTP_MAX_CONNECTIONS,
+                            max_keepalive_connections=settings.HTTP_MAX_CONNECTIONS),
+        headers={"Accept-Language": "en-US"},
+    )
 
     llm_provider_factory = LLMProviderFactory(settings)
     vdb_provider_factory = VDBFactory(settings)
 
-    # generation client
-    app.generation_client = llm_provider_factory.create(provider=settings.GENERATION_BACKEND)
-    app.generation_client.set_generation_model(model_id=settings.GENERATION_MODEL_ID)
+    # generation client, the provider SDK is imported here
+    with startup_timer.measure("step", "generation client"):
+        app.generation_client = llm_provider_factory.create(provider=settings.GENERATION_BACKEND)
+        app.generation_client.set_generation_model(model_id=settings.GENERATION_MODEL_ID)
 
     # embedding client
-    app.embedding_client = llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
-    app.embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
+    with startup_timer.measure("step", "embedding client"):
+        embedding_client = llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
+        embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
                                              embedding_size=settings.EMBEDDING_SIZE)
-    
+        embedding_scheduler = EmbeddingScheduler(
+            client=embedding_client,
+            max_concurrency=settings.EMBEDDING_MAX_CONCURRENCY,
+            requests_per_minute=settings.EMBEDDING_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.EMBEDDING_TOKENS_PER_MINUTE,
+            max_retries=settings.EMBEDDING_MAX_RETRIES,
+            max_backoff=settings.EMBEDDING_MAX_BACKOFF_SECONDS,
+        )
+        # only cache misses reach the scheduler and the embedding backend
+        embedding_cache_store = None
+        if settings.EMBEDDING_CACHE_PERSISTENT:
+            embedding_cache_store = await EmbeddingCacheModel.get_instance(db_client=app.mongodb_client)
+        app.embedding_client = EmbeddingCache(
+            client=embedding_scheduler,
+            provider=settings.EMBEDDING_BACKEND,
+            store=embedding_cache_store,
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+        )
+
     # vector db client
-    app.vectordb_client = vdb_provider_factory.create(provider=settings.VECTOR_DB_BACKEND)
-    await app.vectordb_client.connect()
+    with startup_timer.measure("step", "vector db client"):
+        app.vectordb_client = vdb_provider_factory.create(provider=settings.VECTOR_DB_BACKEND)
+        await app.vectordb_client.connect()
 
-    app.template_parser = TemplateParser(
-        language=settings.PRIMARY_LANG,
-        default_language=settings.DEFAULT_LANG,
-    )
+    with startup_timer.measure("step", "templates"):
+        app.template_parser = TemplateParser(
+            language=settings.PRIMARY_LANG,
+            default_language=settings.DEFAULT_LANG,
+        )
+
+    # query vectors and answers per video, invalidated when a video is re-indexed or deleted
+    app.query_cache = TTLCache(max_entries=settings.RAG_QUERY_CACHE_MAX_ENTRIES,
+                               ttl_seconds=settings.RAG_QUERY_CACHE_TTL_SECONDS)
+    app.answer_cache = TTLCache(max_entries=settings.RAG_ANSWER_CACHE_MAX_ENTRIES,
+                                ttl_seconds=settings.RAG_ANSWER_CACHE_TTL_SECONDS)
+    # BM25 indexes loaded by sparse and hybrid searches
+    app.lexical_index_cache = TTLCache(max_entries=settings.LEXICAL_INDEX_CACHE_MAX_ENTRIES,
+                                       ttl_seconds=settings.LEXICAL_INDEX_CACHE_TTL_SECONDS)
+
+    # background ingestion workers, jobs left running by a previous process are resumed
+    with startup_timer.measure("step", "job workers"):
+        app.job_controller = JobController(app=app)
+        await app.job_controller.start()
+
+    startup_timer.finish()
 
 @app.on_event("shutdown")
 async def shutdown():
+    await app.job_controller.stop()
     app.mongodb_conn.close()
+    await app.http_client.aclose()
     await app.vectordb_client.disconnect()
+    shutdown_executor()
 
 app.include_router(base.base_router)
 app.include_router(data.data_router, tags=["Data"])
 app.include_router(rag.rag_router, tags=["RAG"])
+app.include_router(jobs.jobs_router, tags=["Jobs"])
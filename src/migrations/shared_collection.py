@@ -0,0 +1,64 @@
+"""
+move videos indexed in per video collections (collection_{video_id}) into the shared collection
+VECTOR_DB_SHARED_COLLECTION, tagging every point with the video id, author and publish time from
+mongodb, run from src/ with the app settings in place:
+
+    python -m migrations.shared_collection --delete-source
+
+set VECTOR_DB_STORAGE_MODE="shared" once it has run, already migrated points are overwritten, not
+duplicated, so it can be re-run after a failure
+"""
+import argparse
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from AI.VectorDB.VDBFactory import VDBFactory
+from AI.VectorDB.VDBEnums import VectorDBStorageMode
+from controllers import RAGController
+from models import VideoModel
+from utils.app_config import get_settings
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--delete-source", action="store_true",
+                        help="drop every per video collection once its points are copied")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    settings = settings.model_copy(update={"VECTOR_DB_STORAGE_MODE": VectorDBStorageMode.SHARED.value})
+
+    mongodb_conn = AsyncIOMotorClient(settings.MONGO_URL)
+    video_model = await VideoModel.get_instance(db_client=mongodb_conn[settings.MONGO_DB])
+
+    vectordb_client = VDBFactory(settings).create(provider=settings.VECTOR_DB_BACKEND)
+    await vectordb_client.connect()
+    try:
+        response = await vectordb_client.list_all_collections()
+        collection_names = sorted(collection.name for collection in response.collections
+                                  if collection.name.startswith(vectordb_client.PER_VIDEO_PREFIX))
+
+        migrated_count = 0
+        for collection_name in collection_names:
+            video_id = collection_name[len(vectordb_client.PER_VIDEO_PREFIX):]
+            video = await video_model.get_video(video_id=video_id)
+            if not video:
+                print(f"{collection_name}: no video {video_id} in mongodb, skipped")
+                continue
+
+            count = await vectordb_client.migrate_collection(collection_name=collection_name,
+                                                             extra_payload=RAGController.video_payload(video),
+                                                             batch_size=args.batch_size,
+                                                             delete_source=args.delete_source)
+            migrated_count += count
+            print(f"{collection_name}: {count} points")
+
+        print(f"migrated {migrated_count} points from {len(collection_names)} collections "
+              f"into '{settings.VECTOR_DB_SHARED_COLLECTION}'")
+    finally:
+        await vectordb_client.disconnect()
+        mongodb_conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
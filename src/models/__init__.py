@@ -1,3 +1,6 @@
 from .base_model import BaseModel
 from .chunks_model import ChunkModel
 from .video_model import VideoModel
+from .job_model import JobModel
+from .embedding_cache_model import EmbeddingCacheModel
+from .lexical_index_model import LexicalIndexModel
@@ -3,7 +3,7 @@ from utils.app_enums import DatabaseEnums
 from .db_schemas import Chunk, Video
 from bson import ObjectId
 from pymongo import InsertOne
-from typing import List
+from typing import AsyncIterator, List
 from utils.logging import get_logger
 logger = get_logger(__name__)
 
@@ -41,6 +41,9 @@ class ChunkModel(BaseModel):
     async def insert_chunks(self, chunks: List[Chunk], batch_size:int=100):
         for i in range(0, len(chunks), batch_size):
             batch = chunks[i: i+batch_size]  
+            # ids are assigned here so callers can reference the stored chunks right away
+            for chunk in batch:
+                chunk.id = chunk.id or ObjectId()
             operation= [InsertOne(chunk.dict(by_alias=True, exclude_unset=True)) for chunk in batch]
             await self.collection.bulk_write(operation)
         return len(chunks)
@@ -52,13 +55,35 @@ class ChunkModel(BaseModel):
             logger.error(f"Error deleting chunks for video ID {video.id}: {e}")
             raise
 
+    async def count_video_chunks(self, video: Video) -> int:
+        return await self.collection.count_documents({"chunk_video_id": video.id})
+
     async def get_video_chunks(self, video: Video, page_no: int = 1, limit: int = 10) -> List[Chunk]:
         try:
             skip = (page_no - 1) * limit
-            cursor = self.collection.find({"chunk_video_id": video.id}).skip(skip).limit(limit)
+            cursor = self.collection.find({"chunk_video_id": video.id}).sort("chunk_index", 1).skip(skip).limit(limit)
             docs = await cursor.to_list(length=limit)
             return [Chunk(**doc) for doc in docs]
         except Exception as e:
             logger.error(f"Error fetching video chunks for video ID {video.id}: {e}")
             return []
 
+    async def iter_video_chunks(self, video: Video, batch_size: int = 100) -> AsyncIterator[List[Chunk]]:
+        """
+        yield the chunks of a video in chunk_index order, batch by batch, every batch is a
+        range query on the (chunk_video_id, chunk_index) index resuming after the last seen index
+        """
+        last_index = -1
+        while True:
+            cursor = self.collection.find(
+                {"chunk_video_id": video.id, "chunk_index": {"$gt": last_index}}
+            ).sort("chunk_index", 1).limit(batch_size).batch_size(batch_size)
+
+            docs = await cursor.to_list(length=batch_size)
+            if not docs:
+                return
+
+            yield [Chunk(**doc) for doc in docs]
+            if len(docs) < batch_size:
+                return
+            last_index = docs[-1]["chunk_index"]
@@ -1,2 +1,3 @@
 from .video import Video
-from .chunks import Chunk, RetrievedDocument
\ No newline at end of file
+from .chunks import Chunk, RetrievedDocument, RetrievedVideo
+from .job import Job
\ No newline at end of file
@@ -7,7 +7,9 @@ class Chunk(BaseModel):
     chunk_video_id: ObjectId
     chunk_text: str = Field(..., min_length=1)
     chunk_index: int = Field(..., ge=0)
-    
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+
     class Config:
         arbitrary_types_allowed = True
 
@@ -18,9 +20,23 @@ class Chunk(BaseModel):
                 "key": [("chunk_video_id", 1)],
                 "name": "chunk_video_id_index_1",
                 "unique": False
+            },
+            {
+                "key": [("chunk_video_id", 1), ("chunk_index", 1)],
+                "name": "chunk_video_id_chunk_index_index_1",
+                "unique": False
             }
         ]
     
 class RetrievedDocument(BaseModel):
     text: str
-    score: float
\ No newline at end of file
+    score: float
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+    video_id: Optional[str] = None
+    chunk_id: Optional[str] = None
+
+class RetrievedVideo(BaseModel):
+    video_id: str
+    score: float
+    documents: List[RetrievedDocument]
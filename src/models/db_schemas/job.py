@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime, timezone
+from bson.objectid import ObjectId
+from utils.app_enums import JobStatusEnum
+
+class Job(BaseModel):
+    id: Optional[ObjectId] = Field(None, alias="_id")
+    job_type: str = Field(..., min_length=1)
+    status: str = JobStatusEnum.QUEUED.value
+    payload: dict = Field(default_factory=dict)
+    progress: dict = Field(default_factory=dict)
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    lease_expires_at: Optional[datetime] = None
+
+    class Config:
+        arbitrary_types_allowed = True
+        allow_population_by_field_name = True
+
+    @classmethod
+    def get_indexes(cls):
+        return [
+            {
+                "key": [("status", 1), ("created_at", 1)],
+                "name": "status_created_at_index_1",
+                "unique": False
+            },
+        ]
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, validator
 from typing import Optional
+from datetime import datetime
 from bson.objectid import ObjectId
 
 class Video(BaseModel):
@@ -10,6 +11,12 @@ class Video(BaseModel):
     description: str = Field(..., min_length=1)
     publish_time: str = Field(..., min_length=1)
 
+    # denormalized counters kept up to date by the ingestion and indexing paths
+    chunks_count: Optional[int] = None
+    vectors_count: Optional[int] = None
+    index_status: Optional[str] = None
+    last_indexed_at: Optional[datetime] = None
+
     @validator('video_id')
     def video_id_validator(cls, v):
         if len(v) != 11:
@@ -0,0 +1,45 @@
+from .base_model import BaseModel
+from utils.app_enums import DatabaseEnums
+from datetime import datetime, timezone
+from pymongo import UpdateOne
+from typing import Dict, List
+
+from utils import logging
+logger = logging.get_logger(__name__)
+
+class EmbeddingCacheModel(BaseModel):
+    """
+    persistent tier of the embedding cache, one document per content key holding the packed vector
+    """
+    def __init__(self, db_client: object):
+        super().__init__(db_client)
+        self.collection = self.db_client[DatabaseEnums.EMBEDDING_CACHE_COLLECTION_NAME.value]
+
+    @classmethod
+    async def get_instance(cls, db_client: object):
+        return cls(db_client=db_client)
+
+    async def get_vectors(self, keys: List[str]) -> Dict[str, bytes]:
+        if not keys:
+            return {}
+
+        cursor = self.collection.find({"_id": {"$in": keys}}, {"vector": 1})
+        return {document["_id"]: document["vector"] async for document in cursor}
+
+    async def insert_vectors(self, vectors: Dict[str, bytes], **metadata):
+        """
+        store new entries, keys already present (written by a concurrent indexing) are left untouched
+        """
+        if not vectors:
+            return
+
+        now = datetime.now(timezone.utc)
+        operations = [
+            UpdateOne(
+                {"_id": key},
+                {"$setOnInsert": {"vector": vector, "created_at": now, **metadata}},
+                upsert=True,
+            )
+            for key, vector in vectors.items()
+        ]
+        await self.collection.bulk_write(operations, ordered=False)
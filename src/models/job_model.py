@@ -0,0 +1,113 @@
+from .base_model import BaseModel
+from utils.app_enums import DatabaseEnums, JobStatusEnum
+from .db_schemas import Job
+from bson import ObjectId
+from datetime import datetime, timedelta, timezone
+from pymongo import ReturnDocument
+
+from utils import logging
+logger = logging.get_logger(__name__)
+
+class JobModel(BaseModel):
+    def __init__(self, db_client: object):
+        super().__init__(db_client)
+        self.collection = self.db_client[DatabaseEnums.JOB_COLLECTION_NAME.value]
+
+    @classmethod
+    async def get_instance(cls, db_client: object):
+        instance = cls(db_client=db_client)
+        await instance.ensure_indexes()
+        return instance
+
+    async def ensure_indexes(self):
+        all_indexes = await self.collection.index_information()
+        for index in Job.get_indexes():
+            if index["name"] not in all_indexes:
+                await self.collection.create_index(
+                    index["key"],
+                    name=index["name"],
+                    unique=index["unique"]
+                )
+
+    async def create_job(self, job: Job):
+        res = await self.collection.insert_one(job.dict(by_alias=True, exclude_unset=False, exclude={"id"}))
+        job.id = res.inserted_id
+        return job
+
+    async def get_job(self, job_id: str):
+        if not ObjectId.is_valid(job_id):
+            return None
+
+        record = await self.collection.find_one({"_id": ObjectId(job_id)})
+        if record is None:
+            return None
+        return Job(**record)
+
+    async def claim_next_job(self, lease_seconds: int):
+        """
+        atomically move the oldest queued job (or a running job whose worker stopped
+        renewing its lease) to running and hand it to the caller
+        """
+        now = datetime.now(timezone.utc)
+        record = await self.collection.find_one_and_update(
+            {"$or": [
+                {"status": JobStatusEnum.QUEUED.value},
+                {"status": JobStatusEnum.RUNNING.value, "lease_expires_at": {"$lt": now}},
+            ]},
+            {
+                "$set": {
+                    "status": JobStatusEnum.RUNNING.value,
+                    "started_at": now,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    # jobs are rerun from the start, so are their counters
+                    "progress": {},
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if record is None:
+            return None
+        return Job(**record)
+
+    async def renew_lease(self, job_id: ObjectId, lease_seconds: int):
+        await self.collection.update_one(
+            {"_id": job_id, "status": JobStatusEnum.RUNNING.value},
+            {"$set": {"lease_expires_at": datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)}}
+        )
+
+    async def increment_progress(self, job_id: ObjectId, **counters):
+        if not counters:
+            return
+        await self.collection.update_one(
+            {"_id": job_id},
+            {"$inc": {f"progress.{name}": value for name, value in counters.items()}}
+        )
+
+    async def complete_job(self, job_id: ObjectId, result: dict):
+        await self.finish_job(job_id=job_id, status=JobStatusEnum.COMPLETED.value, result=result)
+
+    async def fail_job(self, job_id: ObjectId, error: str, result: dict = None):
+        await self.finish_job(job_id=job_id, status=JobStatusEnum.FAILED.value, result=result, error=error)
+
+    async def finish_job(self, job_id: ObjectId, status: str, result: dict = None, error: str = None):
+        await self.collection.update_one(
+            {"_id": job_id},
+            {"$set": {
+                "status": status,
+                "result": result,
+                "error": error,
+                "finished_at": datetime.now(timezone.utc),
+                "lease_expires_at": None,
+            }}
+        )
+
+    async def requeue_job(self, job_id: ObjectId):
+        """
+        give an interrupted job back to the queue so the next worker picks it up
+        """
+        await self.collection.update_one(
+            {"_id": job_id, "status": JobStatusEnum.RUNNING.value},
+            {"$set": {"status": JobStatusEnum.QUEUED.value, "lease_expires_at": None}}
+        )
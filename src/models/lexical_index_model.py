@@ -0,0 +1,31 @@
+from .base_model import BaseModel
+from utils.app_enums import DatabaseEnums
+from datetime import datetime, timezone
+
+from utils import logging
+logger = logging.get_logger(__name__)
+
+class LexicalIndexModel(BaseModel):
+    """
+    BM25 index of every indexed video, one document per video keyed by its video id
+    """
+    def __init__(self, db_client: object):
+        super().__init__(db_client)
+        self.collection = self.db_client[DatabaseEnums.LEXICAL_INDEX_COLLECTION_NAME.value]
+
+    @classmethod
+    async def get_instance(cls, db_client: object):
+        return cls(db_client=db_client)
+
+    async def get_index(self, video_id: str):
+        return await self.collection.find_one({"_id": video_id})
+
+    async def save_index(self, video_id: str, document: dict):
+        await self.collection.replace_one(
+            {"_id": video_id},
+            {**document, "updated_at": datetime.now(timezone.utc)},
+            upsert=True,
+        )
+
+    async def delete_index(self, video_id: str):
+        await self.collection.delete_one({"_id": video_id})
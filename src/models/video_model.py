@@ -50,6 +50,16 @@ class VideoModel(BaseModel):
             logger.error(f"Error fetching video by ID {video_id}: {e}")
             raise
 
+    async def update_video_stats(self, video_id: str, **fields):
+        """
+        set the denormalized chunks_count, vectors_count, index_status and last_indexed_at fields
+        """
+        try:
+            await self.collection.update_one({"video_id": video_id}, {"$set": fields})
+        except Exception as e:
+            logger.error(f"Error updating stats of video {video_id}: {e}")
+            raise
+
     async def delete_video(self, video_id: str):
         try:
             await self.collection.delete_one({"video_id": video_id})
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from utils.app_config import get_settings, settings
+from utils.startup_timing import startup_timer
 
 base_router = APIRouter()
 
@@ -12,4 +13,23 @@ async def welcome(settings: settings = Depends(get_settings)):
     return "Welcome to {project_name} API, version {version}".format(
         project_name=project_name,
         version=version
-    )
\ No newline at end of file
+    )
+
+@base_router.get("/stats/embedding")
+async def embedding_stats(request: Request):
+    return request.app.embedding_client.get_stats()
+
+@base_router.get("/stats/rag_cache")
+async def rag_cache_stats(request: Request):
+    return {
+        "query_cache": request.app.query_cache.get_stats(),
+        "answer_cache": request.app.answer_cache.get_stats(),
+    }
+
+@base_router.get("/stats/vectordb_memory")
+async def vectordb_memory_stats(request: Request, limit: int = 100):
+    return await request.app.vectordb_client.get_memory_report(limit=limit)
+
+@base_router.get("/stats/startup")
+async def startup_stats():
+    return startup_timer.get_report()
@@ -1,86 +1,31 @@
 from fastapi import APIRouter, Depends, status, Request
 from fastapi.responses import JSONResponse
 from utils.app_config import get_settings, settings
-from utils.app_enums import ResponseSignals
+from utils.app_enums import ResponseSignals, IndexStatusEnum
 from utils import logging
-from controllers import DataController, RAGController, TextProcessor
+from controllers import RAGController, IngestionController
 from .schema import ProcessRequest
 from models import VideoModel, ChunkModel
-from models.db_schemas import Video, Chunk
+from .dependencies import get_video_model, get_chunk_model, get_rag_controller, get_ingestion_controller
 
 logger = logging.get_logger(__name__)
 
 data_router = APIRouter()
 
 @data_router.post("/data/upload_url")
-async def upload_video(request:Request, process_request:ProcessRequest, settings:settings= Depends(get_settings)):
+async def upload_video(request:Request, process_request:ProcessRequest, settings:settings= Depends(get_settings),
+                       ingestion_controller: IngestionController = Depends(get_ingestion_controller)):
 
-    data_controller = DataController(video_url=process_request.video_url)
-    video_id = await data_controller.get_video_id()
-    if not video_id:
-        logger.error("Invalid video URL provided")
-        return JSONResponse(
-            status_code=status.HTTP_404_NOT_FOUND,
-            content={"signal": ResponseSignals.INVALID_VIDEO_URL.value}
-        )
-    
-    video_model = await VideoModel.get_instance(db_client=request.app.mongodb_client)
-    video = await video_model.get_video(video_id=video_id)
-    if video:
-        logger.warning(f"Video with ID {video_id} already exists in the database.")
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={
-                "signal": ResponseSignals.VIDEO_ALREADY_EXISTS.value,
-                "video_id": video.video_id,
-            }
-        )
-
-    # if video does not exist, proceed to fetch metadata and transcript
-    metadata = await data_controller.get_video_metadata(video_id=video_id)
-    video = await video_model.create_video(
-        video=Video(
-            video_id=video_id,
-            title=metadata["title"],
-            author=metadata["author"],
-            description=metadata["description"],
-            publish_time=metadata["publish_time"],
-        )
-    )
-
-    transcript = data_controller.get_video_transcript(video_id=video_id)
-    if not transcript:
-        return JSONResponse(
-            status_code=status.HTTP_404_NOT_FOUND,
-            content={"signal": ResponseSignals.TRANSCRIPT_NOT_FOUND.value}
-        )
-
-    text_processor = TextProcessor()
-    processed_chunks = await text_processor.transcript_chunks(transcript=transcript)
-    
-    chunks = [
-        Chunk(
-            chunk_text=chunk_text,
-            chunk_index=i,
-            chunk_video_id=video.id
-        ) for i, chunk_text in enumerate(processed_chunks)
-    ]
-
-    chunks_model = await ChunkModel.get_instance(db_client=request.app.mongodb_client)
-    await chunks_model.insert_chunks(chunks=chunks)
+    success, content = await ingestion_controller.upload_video(video_url=process_request.video_url,
+                                                               do_index=process_request.do_index)
 
     return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content={
-            "signal": ResponseSignals.VIDEO_PROCESSING_SUCCESS.value,
-            "video_id": video.video_id,
-            "num_chunks": len(chunks)
-        }
+        status_code=status.HTTP_200_OK if success else status.HTTP_404_NOT_FOUND,
+        content=content
     )
 
 @data_router.get("/data/videos")
-async def list_videos(request:Request):
-    video_model = await VideoModel.get_instance(db_client=request.app.mongodb_client)
+async def list_videos(request:Request, video_model: VideoModel = Depends(get_video_model)):
     videos = await video_model.get_all_videos()
 
     if not videos or len(videos) == 0:
@@ -111,8 +56,9 @@ async def list_videos(request:Request):
     )
 
 @data_router.get("/data/videos/{video_id}")
-async def get_video_details(request:Request, video_id:str):
-    video_model = await VideoModel.get_instance(db_client=request.app.mongodb_client)
+async def get_video_details(request:Request, video_id:str,
+                            video_model: VideoModel = Depends(get_video_model),
+                            chunk_model: ChunkModel = Depends(get_chunk_model)):
     video = await video_model.get_video(video_id=video_id)
     if not video:
         return JSONResponse(
@@ -122,20 +68,11 @@ async def get_video_details(request:Request, video_id:str):
             }
         )
     
-    chunk_model = await ChunkModel.get_instance(db_client=request.app.mongodb_client)
-
-    chunks_count = 0
-    has_records = True
-    page_no = 1
-    while has_records:
-        page_chunks = await chunk_model.get_video_chunks(video=video, page_no=page_no)
-        if page_chunks and len(page_chunks):
-            chunks_count += len(page_chunks)
-            page_no += 1
-        
-        if not page_chunks or len(page_chunks) == 0:
-            has_records = False
-            break
+    chunks_count = video.chunks_count
+    if chunks_count is None:
+        # videos stored before the counters existed, count once and keep the result
+        chunks_count = await chunk_model.count_video_chunks(video=video)
+        await video_model.update_video_stats(video_id=video.video_id, chunks_count=chunks_count)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -144,6 +81,9 @@ async def get_video_details(request:Request, video_id:str):
             "video": {
                 "video_id": video.video_id,
                 "video_chunks_count": chunks_count,
+                "vectors_count": video.vectors_count or 0,
+                "index_status": video.index_status or IndexStatusEnum.NOT_INDEXED.value,
+                "last_indexed_at": video.last_indexed_at.isoformat() if video.last_indexed_at else None,
                 "title": video.title,
                 "author": video.author,
                 "description": video.description,
@@ -153,9 +93,10 @@ async def get_video_details(request:Request, video_id:str):
     )
 
 @data_router.delete("/data/delete_video/{video_id}")
-async def delete_video(request:Request, video_id:str):
-    chunk_model = await ChunkModel.get_instance(db_client=request.app.mongodb_client)
-    video_model = await VideoModel.get_instance(db_client=request.app.mongodb_client)
+async def delete_video(request:Request, video_id:str,
+                       video_model: VideoModel = Depends(get_video_model),
+                       chunk_model: ChunkModel = Depends(get_chunk_model),
+                       rag_controller: RAGController = Depends(get_rag_controller)):
 
     video = await video_model.get_video(video_id=video_id)
     if not video:
@@ -168,14 +109,9 @@ async def delete_video(request:Request, video_id:str):
 
     await chunk_model.del_video_chunks(video)
     await video_model.delete_video(video_id)
-    
-    rag_controller = RAGController(
-        vectordb_client=request.app.vectordb_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser,
-    )
     await rag_controller.reset_vdb_collection(video_id)
+    await rag_controller.delete_lexical_index(video_id=video_id)
+    rag_controller.invalidate_video_cache(video_id=video_id)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -0,0 +1,41 @@
+from fastapi import Request
+from controllers import IngestionController, RAGController
+from models import VideoModel, ChunkModel, JobModel
+
+# models and clients are created once in the startup hook and shared by every request
+
+def get_video_model(request: Request) -> VideoModel:
+    return request.app.video_model
+
+def get_chunk_model(request: Request) -> ChunkModel:
+    return request.app.chunk_model
+
+def get_job_model(request: Request) -> JobModel:
+    return request.app.job_model
+
+def get_rag_controller(request: Request) -> RAGController:
+    return RAGController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        query_cache=request.app.query_cache,
+        answer_cache=request.app.answer_cache,
+        lexical_index_model=request.app.lexical_index_model,
+        lexical_index_cache=request.app.lexical_index_cache,
+    )
+
+def get_ingestion_controller(request: Request) -> IngestionController:
+    return IngestionController(
+        video_model=request.app.video_model,
+        chunk_model=request.app.chunk_model,
+        http_client=request.app.http_client,
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        query_cache=request.app.query_cache,
+        answer_cache=request.app.answer_cache,
+        lexical_index_model=request.app.lexical_index_model,
+        lexical_index_cache=request.app.lexical_index_cache,
+    )
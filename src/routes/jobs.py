@@ -0,0 +1,101 @@
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import JSONResponse
+from .schema import ProcessRequest, PushRequest, BulkProcessRequest
+from utils.app_enums import ResponseSignals, JobTypeEnum
+from models import JobModel
+from .dependencies import get_job_model
+from utils import logging
+
+logger = logging.get_logger(__name__)
+
+jobs_router = APIRouter()
+
+@jobs_router.post("/jobs/upload_url")
+async def enqueue_upload(request: Request, process_request: ProcessRequest):
+
+    job = await request.app.job_controller.enqueue(
+        job_type=JobTypeEnum.UPLOAD_URL.value,
+        payload={"video_url": process_request.video_url, "do_index": process_request.do_index},
+    )
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "signal": ResponseSignals.JOB_ENQUEUED.value,
+            "job_id": str(job.id),
+        }
+    )
+
+@jobs_router.post("/jobs/collections/{video_id}/index")
+async def enqueue_index(request: Request, video_id: str, push_request: PushRequest):
+
+    job = await request.app.job_controller.enqueue(
+        job_type=JobTypeEnum.INDEX.value,
+        payload={"video_id": video_id, "do_reset": push_request.do_reset},
+    )
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "signal": ResponseSignals.JOB_ENQUEUED.value,
+            "job_id": str(job.id),
+        }
+    )
+
+@jobs_router.post("/jobs/bulk_upload")
+async def enqueue_bulk_upload(request: Request, bulk_request: BulkProcessRequest):
+
+    if not bulk_request.video_urls and not bulk_request.playlist_id:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignals.BULK_NO_VIDEOS.value}
+        )
+
+    job = await request.app.job_controller.enqueue(
+        job_type=JobTypeEnum.BULK_UPLOAD.value,
+        payload={
+            "video_urls": bulk_request.video_urls,
+            "playlist_id": bulk_request.playlist_id,
+            "do_index": bulk_request.do_index,
+        },
+    )
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "signal": ResponseSignals.JOB_ENQUEUED.value,
+            "job_id": str(job.id),
+        }
+    )
+
+@jobs_router.get("/jobs/{job_id}")
+async def get_job_status(request: Request, job_id: str, job_model: JobModel = Depends(get_job_model)):
+
+    job = await job_model.get_job(job_id=job_id)
+    if not job:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignals.JOB_NOT_FOUND.value
+            }
+        )
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "signal": ResponseSignals.JOB_FETCH_SUCCESS.value,
+            "job": {
+                "job_id": str(job.id),
+                "job_type": job.job_type,
+                "status": job.status,
+                "payload": job.payload,
+                "progress": job.progress,
+                "result": job.result,
+                "error": job.error,
+                "attempts": job.attempts,
+                "created_at": job.created_at.isoformat(),
+                "started_at": job.started_at.isoformat() if job.started_at else None,
+                "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+            }
+        }
+    )
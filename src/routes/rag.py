@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Request, status
-from fastapi.responses import JSONResponse
-from controllers import RAGController
-from models import VideoModel, ChunkModel
-from .schema import SearchRequest, PushRequest
+import json
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from controllers import RAGController, IngestionController
+from AI.VectorDB import CollectionNotFoundError, UnsupportedStorageModeError
+from models import VideoModel
+from .dependencies import get_video_model, get_rag_controller, get_ingestion_controller
+from .schema import SearchRequest, VideosSearchRequest, PushRequest
 from utils.app_enums import ResponseSignals
 from utils import logging
 
@@ -11,65 +14,65 @@ logger = logging.get_logger(__name__)
 rag_router = APIRouter()
 
 @rag_router.post("/collections/{video_id}/index")
-async def index_video(request: Request, video_id: str, push_request: PushRequest):
+async def index_video(request: Request, video_id: str, push_request: PushRequest,
+                      ingestion_controller: IngestionController = Depends(get_ingestion_controller)):
 
-    video_model = await VideoModel.get_instance(db_client=request.app.mongodb_client)
-    chunk_model = await ChunkModel.get_instance(db_client=request.app.mongodb_client)
+    success, content = await ingestion_controller.index_video(video_id=video_id,
+                                                              do_reset=push_request.do_reset)
 
-    video = await video_model.get_video(video_id=video_id)
-    if not video:
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if success else status.HTTP_404_NOT_FOUND,
+        content=content
+    )
+
+@rag_router.post("/search")
+async def search_videos(request: Request, search_request: VideosSearchRequest,
+                        rag_controller: RAGController = Depends(get_rag_controller)):
+    """
+    search across all videos, optionally restricted to video ids, authors and a publish date range,
+    the chunks are grouped by video and videos are ranked by their best chunk
+    """
+    try:
+        results = await rag_controller.search_videos(
+            query=search_request.query,
+            limit=search_request.limit,
+            group_size=search_request.group_size,
+            video_ids=search_request.video_ids,
+            authors=search_request.authors,
+            published_after=search_request.published_after,
+            published_before=search_request.published_before,
+        )
+    except UnsupportedStorageModeError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignals.VECTORDB_STORAGE_MODE_UNSUPPORTED.value})
+    except CollectionNotFoundError:
         return JSONResponse(
             status_code=status.HTTP_404_NOT_FOUND,
             content={
-                "signal": ResponseSignals.VIDEO_NOT_FOUND.value})
-    
-    rag_controller = RAGController(
-        vectordb_client=request.app.vectordb_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser,
-    )
-    collection_name = rag_controller.create_collection_name(video_id=video.video_id)
-    await rag_controller.create_vdb_collection(
-        video_id=video.video_id,
-        embedding_size=request.app.embedding_client.embedding_size,
-        do_reset=push_request.do_reset,
-    )
+                "signal": ResponseSignals.VECTORDB_COLLECTION_NOT_FOUND.value})
 
-    has_records = True
-    page_no = 1
-    inserted_items_count = 0
-
-    while has_records:
-        page_chunks = await chunk_model.get_video_chunks(video=video, page_no=page_no)
-        if len(page_chunks):
-            logger.info(f"Fetched {len(page_chunks)} chunks from database for page {page_no}")
-            page_no += 1
-        
-        if not page_chunks or len(page_chunks) == 0:
-            logger.info(f"No more chunks found for video {video.id} on page {page_no}")
-            has_records = False
-            break
-        
-        await rag_controller.index_into_vdb_collection(
-            chunks=page_chunks,
-            collection_name=collection_name,
-        )
-        inserted_items_count += len(page_chunks)
-        logger.info(f"Inserted {inserted_items_count} items so far...")
-        
+    if not results:
+        return JSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND,
+                content={
+                    "signal": ResponseSignals.VECTORDB_NO_RESULTS_FOUND.value
+                }
+            )
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
-            "signal": ResponseSignals.VECTORDB_INSERT_SUCCESS.value,
-            "inserted_items_count": inserted_items_count
+            "signal": ResponseSignals.VECTORDB_SEARCH_SUCCESS.value,
+            "results": [result.dict() for result in results]
         }
     )
 
 @rag_router.post("/collections/{video_id}/search")
-async def search(request: Request, video_id: str, search_request: SearchRequest):
+async def search(request: Request, video_id: str, search_request: SearchRequest,
+                video_model: VideoModel = Depends(get_video_model),
+                rag_controller: RAGController = Depends(get_rag_controller)):
     
-    video_model = await VideoModel.get_instance(db_client=request.app.mongodb_client)
     video = await video_model.get_video(video_id=video_id)
     if not video:
         return JSONResponse(
@@ -77,18 +80,21 @@ async def search(request: Request, video_id: str, search_request: SearchRequest)
             content={
                 "signal": ResponseSignals.VIDEO_NOT_FOUND.value})   
 
-    rag_controller = RAGController(
-        vectordb_client=request.app.vectordb_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser,
-    )
+    try:
+        results = await rag_controller.search_query(
+            video=video,
+            query=search_request.query,
+            limit=search_request.limit,
+            mode=search_request.mode.value if search_request.mode else None,
+            hnsw_ef=search_request.hnsw_ef,
+            exact=bool(search_request.exact),
+        )
+    except CollectionNotFoundError:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignals.VECTORDB_COLLECTION_NOT_FOUND.value})
 
-    results = await rag_controller.search_query(
-        video=video,
-        query=search_request.query,
-        limit=search_request.limit
-    )
     if not results:
         return JSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -105,23 +111,24 @@ async def search(request: Request, video_id: str, search_request: SearchRequest)
     )
 
 @rag_router.post("/collections/{video_id}/answer")
-async def answer_rag(request: Request, video_id: str, search_request: SearchRequest):
+async def answer_rag(request: Request, video_id: str, search_request: SearchRequest,
+                    video_model: VideoModel = Depends(get_video_model),
+                    rag_controller: RAGController = Depends(get_rag_controller)):
     
-    video_model = await VideoModel.get_instance(db_client=request.app.mongodb_client)
     video = await video_model.get_video(video_id=video_id)
 
-    rag_controller = RAGController(
-        vectordb_client=request.app.vectordb_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser,
-    )
-
-    answer, full_prompt = await rag_controller.answer_question(
-        video=video,
-        query=search_request.query,
-        limit=search_request.limit,
-    )
+    try:
+        answer, full_prompt = await rag_controller.answer_question(
+            video=video,
+            query=search_request.query,
+            limit=search_request.limit,
+            mode=search_request.mode.value if search_request.mode else None,
+        )
+    except CollectionNotFoundError:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignals.VECTORDB_COLLECTION_NOT_FOUND.value})
 
     if not answer:
         return JSONResponse(
@@ -136,4 +143,42 @@ async def answer_rag(request: Request, video_id: str, search_request: SearchRequ
             "answer": answer,
             "full_prompt": full_prompt,
         }
-    )
\ No newline at end of file
+    )
+
+@rag_router.post("/collections/{video_id}/answer/stream")
+async def answer_rag_stream(request: Request, video_id: str, search_request: SearchRequest,
+                            video_model: VideoModel = Depends(get_video_model),
+                            rag_controller: RAGController = Depends(get_rag_controller)):
+    """
+    stream the answer as newline delimited json events (or server-sent events when the client
+    accepts text/event-stream): the retrieved documents first, then the answer tokens, then done
+    """
+    video = await video_model.get_video(video_id=video_id)
+    if not video:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignals.VIDEO_NOT_FOUND.value})
+
+    use_sse = "text/event-stream" in request.headers.get("accept", "")
+    events = rag_controller.stream_answer(
+        video=video,
+        query=search_request.query,
+        limit=search_request.limit,
+        mode=search_request.mode.value if search_request.mode else None,
+    )
+
+    async def body():
+        # a client disconnect closes this generator, which closes the upstream generation
+        try:
+            async for event in events:
+                line = json.dumps(event, ensure_ascii=False)
+                yield f"data: {line}\n\n" if use_sse else f"{line}\n"
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream" if use_sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1 +1 @@
-from .request_schemas import PushRequest, SearchRequest, ProcessRequest
\ No newline at end of file
+from .request_schemas import PushRequest, SearchRequest, VideosSearchRequest, ProcessRequest, BulkProcessRequest
\ No newline at end of file
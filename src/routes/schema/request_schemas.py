@@ -1,13 +1,35 @@
 from pydantic import Field
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+from datetime import datetime
+from utils.app_enums import SearchModeEnum
 
 class ProcessRequest(BaseModel):
     video_url: str = Field(..., example="https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+    do_index: Optional[int] = 0
+
+class BulkProcessRequest(BaseModel):
+    video_urls: Optional[List[str]] = Field(None, example=["https://www.youtube.com/watch?v=dQw4w9WgXcQ"])
+    playlist_id: Optional[str] = Field(None, example="PLFgquLnL59alCl_2TQvOiD5Vgm1hCaGSI")
+    do_index: Optional[int] = 1
 
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
 
 class SearchRequest(BaseModel):
     query: str = Field(..., example="What is the main topic of the video?")
-    limit: Optional[int] = 5
\ No newline at end of file
+    limit: Optional[int] = 5
+    # dense, sparse or hybrid, RETRIEVAL_DEFAULT_MODE when not set
+    mode: Optional[SearchModeEnum] = None
+    # vector search accuracy/latency trade-off of this query: a wider HNSW beam, or an exact scan
+    hnsw_ef: Optional[int] = Field(None, ge=1, le=4096)
+    exact: Optional[bool] = False
+
+class VideosSearchRequest(BaseModel):
+    query: str = Field(..., example="How do transformers use attention?")
+    limit: Optional[int] = Field(10, ge=1, le=100)
+    group_size: Optional[int] = Field(3, ge=1, le=20)
+    video_ids: Optional[List[str]] = None
+    authors: Optional[List[str]] = None
+    published_after: Optional[datetime] = None
+    published_before: Optional[datetime] = None
@@ -1,3 +1,5 @@
+from functools import lru_cache
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class settings(BaseSettings):
@@ -5,6 +7,8 @@ class settings(BaseSettings):
     APP_NAME: str 
     APP_VERSION: str 
     YOUTUBE_API: str
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_TIMEOUT_SECONDS: float = 15.0
     MONGO_URL: str
     MONGO_DB: str = "vidbot"
 
@@ -23,11 +27,60 @@ class settings(BaseSettings):
     DEFAULT_MAX_TOKENS: int
     DEFAULT_TEMPERATURE: float
 
+    INDEXING_BATCH_SIZE: int = 100
+    INGEST_BATCH_SIZE: int = 256
+    INGEST_PREFETCH_BATCHES: int = 2
+    BLOCKING_IO_MAX_WORKERS: int = 8
+    CHUNKING_OFFLOAD_MIN_SNIPPETS: int = 2000
+
+    EMBEDDING_MAX_CONCURRENCY: int = 4
+    EMBEDDING_REQUESTS_PER_MINUTE: int = 0
+    EMBEDDING_TOKENS_PER_MINUTE: int = 0
+    EMBEDDING_MAX_RETRIES: int = 5
+    EMBEDDING_MAX_BACKOFF_SECONDS: float = 60.0
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 10000
+    EMBEDDING_CACHE_PERSISTENT: int = 1
+
+    JOB_WORKERS: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    JOB_LEASE_SECONDS: int = 60
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_SHUTDOWN_TIMEOUT_SECONDS: float = 30.0
+
+    BULK_FETCH_CONCURRENCY: int = 8
+    BULK_INDEX_CONCURRENCY: int = 2
+
     VECTOR_DB_BACKEND : str
     VECTOR_DB_HOST : str
     VECTOR_DB_PORT : int
     VECTOR_DB_GRPC_PORT : int
     VECTOR_DB_DISTANCE_METHOD : str
+    VECTOR_DB_UPSERT_BATCH_SIZE : int = 256
+    VECTOR_DB_PREFER_GRPC : int = 0
+    VECTOR_DB_TIMEOUT_SECONDS : int = 30
+    VECTOR_DB_MAX_CONNECTIONS : int = 20
+    VECTOR_DB_STORAGE_MODE : str = "per_video"
+    VECTOR_DB_SHARED_COLLECTION : str = "video_chunks"
+    VECTOR_DB_SHARD_NUMBER : int = 1
+    VECTOR_DB_PATH : str = "assets/vector_db"
+    VECTOR_DB_COLLECTION_PROFILE : str = "default"
+    VECTOR_DB_HNSW_M : Optional[int] = None
+    VECTOR_DB_HNSW_EF_CONSTRUCT : Optional[int] = None
+    VECTOR_DB_HNSW_EF : Optional[int] = None
+    VECTOR_DB_RESCORE_OVERSAMPLING : float = 2.0
+    VECTOR_DB_COARSE_SIZE : int = 0
+    VECTOR_DB_COARSE_OVERSAMPLING : int = 4
+
+    RAG_QUERY_CACHE_MAX_ENTRIES: int = 2000
+    RAG_QUERY_CACHE_TTL_SECONDS: float = 3600
+    RAG_ANSWER_CACHE_MAX_ENTRIES: int = 500
+    RAG_ANSWER_CACHE_TTL_SECONDS: float = 600
+
+    RETRIEVAL_DEFAULT_MODE: str = "dense"
+    RETRIEVAL_HYBRID_CANDIDATES_FACTOR: int = 4
+    RETRIEVAL_RRF_K: int = 60
+    LEXICAL_INDEX_CACHE_MAX_ENTRIES: int = 200
+    LEXICAL_INDEX_CACHE_TTL_SECONDS: float = 3600
 
     PRIMARY_LANG : str = "en"
     DEFAULT_LANG : str = "en"
@@ -35,5 +88,7 @@ class settings(BaseSettings):
     class Config:
         env_file= "src/.env"
 
+@lru_cache
 def get_settings() -> settings:
+    # the env file is parsed once per process
     return settings()
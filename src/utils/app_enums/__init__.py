@@ -1,2 +1,5 @@
 from .database_enums import DatabaseEnums
-from .response_enums import ResponseSignals
\ No newline at end of file
+from .response_enums import ResponseSignals
+from .job_enums import JobStatusEnum, JobTypeEnum
+from .video_enums import IndexStatusEnum
+from .search_enums import SearchModeEnum
\ No newline at end of file
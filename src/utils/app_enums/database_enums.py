@@ -4,5 +4,8 @@ class DatabaseEnums(Enum):
 
     VIDEO_COLLECTION_NAME = "videos"
     CHUNK_COLLECTION_NAME = "chunks"
+    JOB_COLLECTION_NAME = "jobs"
+    EMBEDDING_CACHE_COLLECTION_NAME = "embedding_cache"
+    LEXICAL_INDEX_COLLECTION_NAME = "lexical_indexes"
 
     
\ No newline at end of file
@@ -0,0 +1,14 @@
+from enum import Enum
+
+class JobStatusEnum(Enum):
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class JobTypeEnum(Enum):
+
+    UPLOAD_URL = "upload_url"
+    INDEX = "index"
+    BULK_UPLOAD = "bulk_upload"
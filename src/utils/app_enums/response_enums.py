@@ -5,6 +5,7 @@ class ResponseSignals(Enum):
     VIDEO_NOT_FOUND = "video not found in db"
     VIDEO_ALREADY_EXISTS = "video already exists in db"
     VIDEO_PROCESSING_SUCCESS = "video processing success"
+    VIDEO_PROCESSING_FAILED = "video processing failed"
     VIDEO_LIST_EMPTY = "no videos found in db"
     VIDEO_LIST_FETCH_SUCCESS = "video list fetch success"
     VIDEO_DELETE_SUCCESS = "video delete success"
@@ -12,15 +13,25 @@ class ResponseSignals(Enum):
 
     RAG_ANSWER_SUCCESS = "rag answer success"
     RAG_NO_ANSWER = "rag no answer found"
+    RAG_ANSWER_INTERRUPTED = "rag answer interrupted, the generation stream failed"
 
     VECTORDB_SEARCH_SUCCESS = "vector db search success"
     VECTORDB_NO_RESULTS_FOUND = "no results found from vector db search"
     VECTORDB_COLLECTION_RETRIEVED = "vector db collection retrieved"
     VECTORDB_INSERT_SUCCESS = "insert into vector db success"
     VECTORDB_INSERT_FAILED = "insert into vector db failed"
+    VECTORDB_COLLECTION_NOT_FOUND = "vector db collection not found, index the video first"
+    VECTORDB_STORAGE_MODE_UNSUPPORTED = "not supported by the configured vector db storage mode"
 
     UNSUPPORTED_LLM_PROVIDER = "unsupported llm provider"
     UNSUPPORTED_VDB_PROVIDER = "unsupported vdb provider"
 
+    JOB_ENQUEUED = "job enqueued"
+    JOB_NOT_FOUND = "job not found"
+    JOB_FETCH_SUCCESS = "job fetch success"
+
+    BULK_PROCESSING_DONE = "bulk processing done"
+    BULK_NO_VIDEOS = "no videos to process"
+
     INVALID_VIDEO_URL = "invalid video url"
     TRANSCRIPT_NOT_FOUND = "transcript not found for video"
\ No newline at end of file
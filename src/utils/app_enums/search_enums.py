@@ -0,0 +1,7 @@
+from enum import Enum
+
+class SearchModeEnum(Enum):
+
+    DENSE = "dense"
+    SPARSE = "sparse"
+    HYBRID = "hybrid"
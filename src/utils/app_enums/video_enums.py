@@ -0,0 +1,8 @@
+from enum import Enum
+
+class IndexStatusEnum(Enum):
+
+    NOT_INDEXED = "not_indexed"
+    INDEXING = "indexing"
+    INDEXED = "indexed"
+    FAILED = "failed"
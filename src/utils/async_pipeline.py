@@ -0,0 +1,37 @@
+import asyncio
+from typing import AsyncIterator, List, Sequence
+
+async def iterate_batches(items: Sequence, batch_size: int) -> AsyncIterator[List]:
+    for i in range(0, len(items), batch_size):
+        yield items[i: i + batch_size]
+
+async def prefetch(source: AsyncIterator, buffer_size: int = 1) -> AsyncIterator:
+    """
+    run an async generator ahead of its consumer in a separate task, keeping up to
+    `buffer_size` items ready so both sides of a pipeline stage overlap
+    """
+    queue = asyncio.Queue(maxsize=max(buffer_size, 1))
+    end = object()
+    error = None
+
+    async def produce():
+        nonlocal error
+        try:
+            async for item in source:
+                await queue.put(item)
+        except Exception as e:
+            error = e
+        await queue.put(end)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is end:
+                break
+            yield item
+
+        if error is not None:
+            raise error
+    finally:
+        producer.cancel()
@@ -0,0 +1,110 @@
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from typing import Dict, Hashable, List, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+def tokenize(text: str) -> List[str]:
+    # numbers, acronyms and product names survive as whole tokens, which is what dense search misses
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    okapi BM25 inverted index over the chunks of one video, the postings of a term are packed
+    uint32 (chunk position, term frequency) pairs so a whole video fits in one small document
+    """
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+        self.chunk_ids = []
+        self.texts = []
+        self.start_times = []
+        self.end_times = []
+        self.lengths = array("I")
+        self.postings = {}
+
+    def __len__(self):
+        return len(self.chunk_ids)
+
+    def add(self, chunk_id: str, text: str, start_time: float = None, end_time: float = None):
+        position = len(self.chunk_ids)
+        term_counts = Counter(tokenize(text))
+        for term, term_count in term_counts.items():
+            self.postings.setdefault(term, array("I")).extend((position, term_count))
+
+        self.chunk_ids.append(chunk_id)
+        self.texts.append(text)
+        self.start_times.append(start_time)
+        self.end_times.append(end_time)
+        self.lengths.append(sum(term_counts.values()))
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[int, float]]:
+        """
+        return up to `limit` (chunk position, score) pairs, best first, chunks sharing no term
+        with the query are never scored
+        """
+        chunks_count = len(self.chunk_ids)
+        if not chunks_count:
+            return []
+
+        average_length = sum(self.lengths) / chunks_count or 1
+        scores = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+
+            document_frequency = len(postings) // 2
+            idf = math.log(1 + (chunks_count - document_frequency + 0.5) / (document_frequency + 0.5))
+            for i in range(0, len(postings), 2):
+                position, term_count = postings[i], postings[i + 1]
+                length_norm = self.k1 * (1 - self.b + self.b * self.lengths[position] / average_length)
+                scores[position] = (scores.get(position, 0.0)
+                                    + idf * term_count * (self.k1 + 1) / (term_count + length_norm))
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def to_document(self) -> dict:
+        terms = sorted(self.postings)
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "chunk_ids": self.chunk_ids,
+            "texts": self.texts,
+            "start_times": self.start_times,
+            "end_times": self.end_times,
+            "lengths": self.lengths.tobytes(),
+            "terms": terms,
+            "postings": [self.postings[term].tobytes() for term in terms],
+        }
+
+    @classmethod
+    def from_document(cls, document: dict):
+        index = cls(k1=document["k1"], b=document["b"])
+        index.chunk_ids = document["chunk_ids"]
+        index.texts = document["texts"]
+        index.start_times = document["start_times"]
+        index.end_times = document["end_times"]
+        index.lengths.frombytes(document["lengths"])
+        for term, packed in zip(document["terms"], document["postings"]):
+            postings = array("I")
+            postings.frombytes(packed)
+            index.postings[term] = postings
+        return index
+
+
+def reciprocal_rank_fusion(rankings: List[List[Hashable]], k: int = 60) -> List[Tuple[Hashable, float]]:
+    """
+    merge several rankings of the same items, each item scores sum(1 / (k + rank)) over the
+    rankings it appears in, so raw scores of different retrievers never have to be compared
+    """
+    scores: Dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,48 @@
+import time
+from contextlib import contextmanager
+from utils import logging
+logger = logging.get_logger(__name__)
+
+class StartupTimer:
+    """
+    records how long each import and startup step takes, so slow cold starts show up in
+    the startup log and on the /stats/startup endpoint
+    """
+    def __init__(self):
+        self.created_at = time.perf_counter()
+        self.finished_at = None
+        self.records = []
+
+    @contextmanager
+    def measure(self, kind: str, name: str):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.records.append({
+                "kind": kind,
+                "name": name,
+                "seconds": round(time.perf_counter() - started_at, 4),
+            })
+
+    def finish(self):
+        self.finished_at = time.perf_counter()
+        self.log_report()
+
+    def get_report(self) -> dict:
+        finished_at = self.finished_at or time.perf_counter()
+        return {
+            "total_seconds": round(finished_at - self.created_at, 4),
+            "imports_seconds": round(sum(r["seconds"] for r in self.records if r["kind"] == "import"), 4),
+            "steps": list(self.records),
+        }
+
+    def log_report(self):
+        report = self.get_report()
+        for record in report["steps"]:
+            logger.info(f"Startup {record['kind']} {record['name']}: {record['seconds'] * 1000:.1f}ms")
+        logger.info(f"Startup finished in {report['total_seconds'] * 1000:.1f}ms "
+                    f"({report['imports_seconds'] * 1000:.1f}ms importing)")
+
+# shared by main.py and the lazy provider packages, created on the first import
+startup_timer = StartupTimer()
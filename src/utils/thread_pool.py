@@ -0,0 +1,28 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from utils.app_config import get_settings
+
+_executor = None
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=get_settings().BLOCKING_IO_MAX_WORKERS,
+            thread_name_prefix="blocking-io",
+        )
+    return _executor
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    run a synchronous call on the bounded thread pool so it never blocks the event loop
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(func, *args, **kwargs))
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """
+    size bounded LRU whose entries expire after `ttl_seconds`, keys live in a namespace
+    (e.g. a video id) that can be invalidated at once by bumping its generation, and
+    concurrent misses on the same key share a single computation
+    """
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self.entries = OrderedDict()
+        self.in_flight = {}
+        self.generations = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def make_key(self, namespace: str, key) -> tuple:
+        # entries of older generations are unreachable and age out of the LRU
+        return namespace, self.generations.get(namespace, 0), key
+
+    def get(self, namespace: str, key):
+        full_key = self.make_key(namespace=namespace, key=key)
+        entry = self.entries.get(full_key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self.entries[full_key]
+            self.expirations += 1
+            return None
+
+        self.entries.move_to_end(full_key)
+        return value
+
+    def set(self, namespace: str, key, value):
+        self.put(full_key=self.make_key(namespace=namespace, key=key), value=value)
+
+    def put(self, full_key: tuple, value):
+        self.entries[full_key] = (time.monotonic() + self.ttl_seconds, value)
+        self.entries.move_to_end(full_key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_compute(self, namespace: str, key, compute):
+        """
+        return the cached value or await `compute()` once for all concurrent callers,
+        None results are not cached
+        """
+        value = self.get(namespace=namespace, key=key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        full_key = self.make_key(namespace=namespace, key=key)
+        task = self.in_flight.get(full_key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(compute())
+            self.in_flight[full_key] = task
+            task.add_done_callback(lambda done: self.finish(full_key=full_key, task=done))
+
+        # a caller going away must not cancel the computation the others are waiting on
+        return await asyncio.shield(task)
+
+    def finish(self, full_key: tuple, task: asyncio.Future):
+        self.in_flight.pop(full_key, None)
+        if task.cancelled() or task.exception() is not None or task.result() is None:
+            return
+
+        self.put_if_current(full_key=full_key, value=task.result())
+
+    def put_if_current(self, full_key: tuple, value):
+        # skip results computed against data invalidated in the meantime
+        if full_key[1] == self.generations.get(full_key[0], 0):
+            self.put(full_key=full_key, value=value)
+
+    def invalidate(self, namespace: str):
+        self.generations[namespace] = self.generations.get(namespace, 0) + 1
+        for full_key in [full_key for full_key in self.entries if full_key[0] == namespace]:
+            del self.entries[full_key]
+
+    def get_stats(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "in_flight": len(self.in_flight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }